@@ -26,7 +26,7 @@ logger = logging.getLogger(__name__)
 # --- HARDCODED CONFIGURATION ---
 FORCE_PROVIDER = "openai"
 FORCE_MODEL = "gpt-3.5-turbo"
-FORCE_API_KEY = "YOUR API KEY
+FORCE_API_KEY = "YOUR API KEY"
 
 # ... (keep list_drafts, get_draft, update_draft, delete_draft, approve_draft, send_draft as is) ...
 # I will just overwrite the create_draft and regenerate_draft functions which are the ones using AI
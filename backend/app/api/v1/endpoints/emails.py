@@ -214,12 +214,12 @@ async def sync_email_account(
 
         # Trigger background classification/indexing when Celery worker is available
         try:
-            from app.workers.tasks import classify_email, index_email
+            from app.workers.tasks import classify_email, enqueue_index
 
             for email in emails:
                 if email:
                     classify_email.delay(str(email.id), str(current_user.id))
-                    index_email.delay(str(email.id), str(current_user.id))
+                    enqueue_index("email", str(email.id), str(current_user.id))
         except Exception:
             # If Celery isn't configured, we still return the sync result
             pass
@@ -277,7 +277,7 @@ async def upload_document(
     content_text = None
     if file_type == "txt":
         content_text = content.decode("utf-8", errors="ignore")
-    # For PDF and DOCX, would use pypdf and python-docx
+    # For PDF and DOCX, would use pypdfium2 and lxml
 
     # Create document record
     document = Document(
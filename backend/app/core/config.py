@@ -105,6 +105,9 @@ class Settings(BaseSettings):
 
     # Whisper STT
     WHISPER_MODEL: str = "base"
+    WHISPER_DEVICE: str = "auto"  # auto, cuda, cpu
+    WHISPER_COMPUTE_TYPE: str = "auto"  # auto, int8_float16, int8, float16
+    WHISPER_PRELOAD: bool = False  # Load the model when a worker process starts
 
     # File paths
     UPLOAD_DIR: str = "/app/uploads"
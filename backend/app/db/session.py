@@ -7,14 +7,18 @@ from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
 
-# Create async engine
+# Create async engine. Compiled statements are cached per engine, so the
+# repeated selects issued by API handlers and worker tasks are compiled once;
+# the cache is kept well above the default of 500 entries to avoid eviction.
 engine = create_async_engine(
     settings.async_database_url,
     echo=settings.DEBUG,
     poolclass=NullPool,
+    query_cache_size=1200,
 )
 
-# Create async session factory
+# Create async session factory. Autoflush is disabled so read-only paths never
+# pay for a flush scan before each query.
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
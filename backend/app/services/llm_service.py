@@ -1,12 +1,66 @@
 """LLM service for handling AI model operations."""
 
 import asyncio
+import hashlib
 import json
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from app.core.config import settings
 from app.core.exceptions import LLMError
 
+if TYPE_CHECKING:
+    import httpx
+
+# Average UTF-8 bytes per token, used when no tokenizer is available
+APPROX_BYTES_PER_TOKEN = 4
+
+# Classifications remembered per service instance, least recently used evicted first
+CLASSIFICATION_CACHE_SIZE = 1024
+
+# Only the start of the body reaches the classification prompt
+CLASSIFICATION_BODY_CHARS = 1000
+
+
+@lru_cache()
+def get_token_encoding():
+    """Get the shared tiktoken encoding, or None if tiktoken is unavailable."""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Truncate text to at most max_tokens tokens.
+
+    Uses tiktoken when installed, otherwise falls back to a byte budget of
+    APPROX_BYTES_PER_TOKEN bytes per token.
+    """
+    encoding = get_token_encoding()
+    if encoding is not None:
+        tokens = encoding.encode_ordinary(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[:max_tokens])
+
+    data = text.encode("utf-8")
+    budget = max_tokens * APPROX_BYTES_PER_TOKEN
+    if len(data) <= budget:
+        return text
+    return data[:budget].decode("utf-8", errors="ignore")
+
+
+@lru_cache()
+def get_sentence_transformer(model_name: str):
+    """Load a sentence-transformers model once per process."""
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
 
 class LLMService:
     """Service for LLM operations."""
@@ -16,10 +70,21 @@ class LLMService:
         provider: str = "local",
         model: Optional[str] = None,
         api_key: Optional[str] = None,
+        http_client: Optional["httpx.AsyncClient"] = None,
     ):
         self.provider = provider
         self.model = model
         self.api_key = api_key
+        # Long-lived callers (Celery workers) pass a pooled client; otherwise a
+        # client is opened per request.
+        self.http_client = http_client
+        self._classification_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+
+    async def close(self):
+        """Close the shared HTTP client, if any."""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
 
     async def generate(
         self,
@@ -72,26 +137,32 @@ class LLMService:
                 messages.append({"role": "system", "content": system_prompt})
             messages.append({"role": "user", "content": prompt})
 
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                response = await client.post(
-                    f"{settings.OLLAMA_BASE_URL}/api/chat",
-                    json={
-                        "model": model,
-                        "messages": messages,
-                        "stream": False,
-                        "options": {
-                            "num_predict": max_tokens,
-                            "temperature": temperature,
-                            "stop": stop or [],
-                        },
-                    },
+            payload = {
+                "model": model,
+                "messages": messages,
+                "stream": False,
+                "options": {
+                    "num_predict": max_tokens,
+                    "temperature": temperature,
+                    "stop": stop or [],
+                },
+            }
+
+            if self.http_client is not None:
+                response = await self.http_client.post(
+                    f"{settings.OLLAMA_BASE_URL}/api/chat", json=payload
                 )
+            else:
+                async with httpx.AsyncClient(timeout=120.0) as client:
+                    response = await client.post(
+                        f"{settings.OLLAMA_BASE_URL}/api/chat", json=payload
+                    )
 
-                if response.status_code != 200:
-                    raise LLMError(f"Ollama error: {response.text}")
+            if response.status_code != 200:
+                raise LLMError(f"Ollama error: {response.text}")
 
-                result = response.json()
-                return result.get("message", {}).get("content", "")
+            result = response.json()
+            return result.get("message", {}).get("content", "")
 
         except Exception as e:
             raise LLMError(f"Local LLM generation failed: {str(e)}")
@@ -297,7 +368,20 @@ Do not include placeholder text like [Your Name].
         body: str,
         sender: str,
     ) -> Dict[str, Any]:
-        """Classify an email using LLM."""
+        """Classify an email using LLM.
+
+        Results are cached per (subject, body, sender), so re-classifying the same
+        email does not cost another LLM call.
+        """
+        body = body[:CLASSIFICATION_BODY_CHARS]
+        cache_key = hashlib.blake2b(
+            "\0".join((subject, body, sender)).encode("utf-8"), digest_size=16
+        ).digest()
+        cached = self._classification_cache.get(cache_key)
+        if cached is not None:
+            self._classification_cache.move_to_end(cache_key)
+            return dict(cached)
+
         prompt = f"""Classify the following email into one of these categories:
 - urgent: Requires immediate attention
 - to_respond: Needs a response but not urgent
@@ -311,7 +395,7 @@ Email:
 From: {sender}
 Subject: {subject}
 
-{body[:1000]}
+{body}
 
 Respond in JSON format:
 {{"category": "...", "language": "...", "sentiment": "...", "priority_score": 0.0-1.0}}"""
@@ -327,11 +411,15 @@ Respond in JSON format:
             start = response.find("{")
             end = response.rfind("}") + 1
             if start >= 0 and end > start:
-                return json.loads(response[start:end])
+                result = json.loads(response[start:end])
+                self._classification_cache[cache_key] = result
+                if len(self._classification_cache) > CLASSIFICATION_CACHE_SIZE:
+                    self._classification_cache.popitem(last=False)
+                return dict(result)
         except json.JSONDecodeError:
             pass
 
-        # Default classification
+        # Default classification (not cached, so a later call can retry the LLM)
         return {
             "category": "fyi",
             "language": "en",
@@ -431,9 +519,7 @@ Answer:"""
     ) -> List[List[float]]:
         """Get embeddings using local model."""
         try:
-            from sentence_transformers import SentenceTransformer
-
-            model = SentenceTransformer("all-MiniLM-L6-v2")
+            model = get_sentence_transformer("all-MiniLM-L6-v2")
 
             loop = asyncio.get_event_loop()
             embeddings = await loop.run_in_executor(
@@ -1,6 +1,6 @@
 """RAG service for knowledge base operations."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from uuid import UUID
 
@@ -19,10 +19,8 @@ class RAGService:
 
     def __init__(
         self,
-        db: AsyncSession,
         llm_service: Optional[LLMService] = None,
     ):
-        self.db = db
         self.llm_service = llm_service or LLMService()
         self._neo4j_driver = None
 
@@ -34,6 +32,7 @@ class RAGService:
             self._neo4j_driver = AsyncGraphDatabase.driver(
                 settings.NEO4J_URI,
                 auth=(settings.NEO4J_USER, settings.NEO4J_PASSWORD),
+                max_connection_pool_size=32,
             )
         return self._neo4j_driver
 
@@ -41,11 +40,13 @@ class RAGService:
         """Close Neo4j connection."""
         if self._neo4j_driver:
             await self._neo4j_driver.close()
+            self._neo4j_driver = None
 
     async def index_email(
         self,
         email_obj: Email,
         user_id: UUID,
+        db: AsyncSession,
     ) -> bool:
         """Index an email in the knowledge graph."""
         try:
@@ -130,8 +131,8 @@ class RAGService:
                     )
 
             # Update email indexed_at
-            email_obj.indexed_at = datetime.utcnow()
-            await self.db.commit()
+            email_obj.indexed_at = datetime.now(timezone.utc)
+            await db.commit()
 
             return True
 
@@ -143,6 +144,7 @@ class RAGService:
         self,
         document: Document,
         user_id: UUID,
+        db: AsyncSession,
     ) -> bool:
         """Index a document in the knowledge graph."""
         try:
@@ -196,8 +198,8 @@ class RAGService:
                     )
 
             # Update document indexed_at
-            document.indexed_at = datetime.utcnow()
-            await self.db.commit()
+            document.indexed_at = datetime.now(timezone.utc)
+            await db.commit()
 
             return True
 
@@ -209,6 +211,7 @@ class RAGService:
         self,
         meeting: Meeting,
         user_id: UUID,
+        db: AsyncSession,
     ) -> bool:
         """Index a meeting in the knowledge graph."""
         try:
@@ -274,7 +277,7 @@ class RAGService:
                             meeting_id=str(meeting.id),
                         )
 
-            await self.db.commit()
+            await db.commit()
             return True
 
         except Exception as e:
@@ -285,6 +288,7 @@ class RAGService:
         self,
         query_text: str,
         user_id: UUID,
+        db: AsyncSession,
         include_emails: bool = True,
         include_documents: bool = True,
         include_meetings: bool = True,
@@ -391,7 +395,7 @@ class RAGService:
             results = results[:max_results]
 
             # Generate answer using LLM
-            context = await self._build_context(results, user_id)
+            context = await self._build_context(results, user_id, db)
             answer = await self.llm_service.answer_question(query_text, context)
 
             return {
@@ -402,12 +406,13 @@ class RAGService:
         except Exception as e:
             print(f"RAG query error: {e}")
             # Fallback to simple text search
-            return await self._fallback_search(query_text, user_id, max_results)
+            return await self._fallback_search(query_text, user_id, db, max_results)
 
     async def _fallback_search(
         self,
         query_text: str,
         user_id: UUID,
+        db: AsyncSession,
         max_results: int,
     ) -> Dict[str, Any]:
         """Fallback to simple database search."""
@@ -417,13 +422,13 @@ class RAGService:
         # Search emails
         from app.models.email_account import EmailAccount
 
-        accounts_result = await self.db.execute(
+        accounts_result = await db.execute(
             select(EmailAccount.id).where(EmailAccount.user_id == user_id)
         )
         account_ids = [row[0] for row in accounts_result.fetchall()]
 
         if account_ids:
-            emails_result = await self.db.execute(
+            emails_result = await db.execute(
                 select(Email)
                 .where(
                     Email.account_id.in_(account_ids),
@@ -447,7 +452,7 @@ class RAGService:
                 )
 
         # Search documents
-        docs_result = await self.db.execute(
+        docs_result = await db.execute(
             select(Document)
             .where(
                 Document.user_id == user_id,
@@ -469,7 +474,7 @@ class RAGService:
             )
 
         # Search meetings
-        meetings_result = await self.db.execute(
+        meetings_result = await db.execute(
             select(Meeting)
             .where(
                 Meeting.user_id == user_id,
@@ -499,13 +504,14 @@ class RAGService:
         self,
         results: List[Dict[str, Any]],
         user_id: UUID,
+        db: AsyncSession,
     ) -> str:
         """Build context string from search results."""
         context_parts = []
 
         for result in results[:5]:
             if result["type"] == "email":
-                email_result = await self.db.execute(
+                email_result = await db.execute(
                     select(Email).where(Email.id == UUID(result["id"]))
                 )
                 email_obj = email_result.scalar_one_or_none()
@@ -515,7 +521,7 @@ class RAGService:
                     )
 
             elif result["type"] == "document":
-                doc_result = await self.db.execute(
+                doc_result = await db.execute(
                     select(Document).where(Document.id == UUID(result["id"]))
                 )
                 doc = doc_result.scalar_one_or_none()
@@ -525,7 +531,7 @@ class RAGService:
                     )
 
             elif result["type"] == "meeting":
-                meeting_result = await self.db.execute(
+                meeting_result = await db.execute(
                     select(Meeting).where(Meeting.id == UUID(result["id"]))
                 )
                 meeting = meeting_result.scalar_one_or_none()
@@ -41,7 +41,7 @@ class TranscriptionService:
                         device = "cpu"
 
                 if compute_type == "auto":
-                    compute_type = "float16" if device == "cuda" else "int8"
+                    compute_type = "int8_float16" if device == "cuda" else "int8"
 
                 self._model = WhisperModel(
                     self.model_size,
@@ -54,6 +54,10 @@ class TranscriptionService:
 
         return self._model
 
+    def warm_up(self) -> None:
+        """Load the Whisper model ahead of the first transcription."""
+        self._get_model()
+
     async def transcribe(
         self,
         audio_path: str,
@@ -1,9 +1,20 @@
 """Celery application configuration."""
 
+import asyncio
+from typing import TYPE_CHECKING, Dict, Optional
+
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    from redis import Redis
+
+    from app.services.llm_service import LLMService
+    from app.services.rag_service import RAGService
+    from app.services.transcription_service import TranscriptionService
+
 celery_app = Celery(
     "openfyxer",
     broker=settings.REDIS_URL,
@@ -34,7 +45,11 @@ celery_app.conf.update(
 )
 
 # Task routing
+# Whisper runs on dedicated GPU workers that keep one warm model each, e.g.
+#   celery -A app.workers.celery_app worker -Q gpu_transcription --pool=solo --concurrency=1
+# with WHISPER_PRELOAD=true.
 celery_app.conf.task_routes = {
+    "app.workers.tasks.transcription_tasks.transcribe_meeting": {"queue": "gpu_transcription"},
     "app.workers.tasks.email_tasks.*": {"queue": "email"},
     "app.workers.tasks.transcription_tasks.*": {"queue": "transcription"},
     "app.workers.tasks.rag_tasks.*": {"queue": "rag"},
@@ -56,3 +71,99 @@ celery_app.conf.beat_schedule = {
         "schedule": 86400.0,  # 24 hours
     },
 }
+
+
+# Per-process service singletons. Neo4j drivers, HTTP clients and Whisper
+# models are expensive to build, so each worker process holds one of each and
+# tasks only inject their own database session.
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LLM: Optional["LLMService"] = None
+_RAG: Optional["RAGService"] = None
+_TRANS: Dict[str, "TranscriptionService"] = {}
+_REDIS: Optional["Redis"] = None
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Get the event loop shared by all tasks in this worker process."""
+    global _LOOP
+    if _LOOP is None or _LOOP.is_closed():
+        _LOOP = asyncio.new_event_loop()
+        asyncio.set_event_loop(_LOOP)
+    return _LOOP
+
+
+def get_llm_service() -> "LLMService":
+    """Get the worker-wide LLM service."""
+    global _LLM
+    if _LLM is None:
+        import httpx
+
+        from app.services.llm_service import LLMService
+
+        _LLM = LLMService(
+            http_client=httpx.AsyncClient(
+                timeout=120.0,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            )
+        )
+    return _LLM
+
+
+def get_rag_service() -> "RAGService":
+    """Get the worker-wide RAG service."""
+    global _RAG
+    if _RAG is None:
+        from app.services.rag_service import RAGService
+
+        _RAG = RAGService(llm_service=get_llm_service())
+    return _RAG
+
+
+def get_transcription_service(model_size: str = settings.WHISPER_MODEL) -> "TranscriptionService":
+    """Get the worker-wide transcription service for a Whisper model size."""
+    if model_size not in _TRANS:
+        from app.services.transcription_service import TranscriptionService
+
+        _TRANS[model_size] = TranscriptionService(
+            model_size=model_size,
+            device=settings.WHISPER_DEVICE,
+            compute_type=settings.WHISPER_COMPUTE_TYPE,
+        )
+    return _TRANS[model_size]
+
+
+def get_redis() -> "Redis":
+    """Get the process-wide Redis client used for task coordination."""
+    global _REDIS
+    if _REDIS is None:
+        from redis import Redis
+
+        _REDIS = Redis.from_url(settings.REDIS_URL)
+    return _REDIS
+
+
+@worker_process_init.connect
+def init_worker_services(**kwargs):
+    """Create long-lived services when a worker process starts."""
+    get_worker_loop()
+    get_rag_service()
+    transcription_service = get_transcription_service()
+    if settings.WHISPER_PRELOAD:
+        transcription_service.warm_up()
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_services(**kwargs):
+    """Release long-lived services when a worker process exits."""
+    global _LOOP, _LLM, _RAG
+    if _LOOP is not None and not _LOOP.is_closed():
+        if _RAG is not None:
+            _LOOP.run_until_complete(_RAG.close())
+        if _LLM is not None:
+            _LOOP.run_until_complete(_LLM.close())
+    if _LOOP is not None and not _LOOP.is_closed():
+        _LOOP.close()
+    _LOOP = None
+    _LLM = None
+    _RAG = None
+    _TRANS.clear()
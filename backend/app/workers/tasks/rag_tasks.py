@@ -1,9 +1,56 @@
 """RAG and indexing Celery tasks."""
 
 import asyncio
+import os
+import re
+from typing import Optional, Tuple
 from uuid import UUID
 
-from app.workers.celery_app import celery_app
+from celery.exceptions import Retry
+from sqlalchemy import bindparam, select
+
+from app.models.document import Document
+from app.models.email import Email
+from app.models.email_account import EmailAccount
+from app.models.meeting import Meeting
+from app.workers.celery_app import (
+    celery_app,
+    get_llm_service,
+    get_rag_service,
+    get_redis,
+    get_worker_loop,
+)
+
+# An entity is indexed by at most one in-flight task: enqueues for an id whose key
+# is still set are dropped, and the key is held across retries until the task ends.
+INDEX_DEDUPE_TTL_SECONDS = 60
+INDEX_RETRY_COUNTDOWN_SECONDS = 30
+
+TXT_READ_CHUNK_SIZE = 1024 * 1024
+SUMMARY_PROMPT_MAX_TOKENS = 2048
+_WORD_RE = re.compile(r"\S+")
+
+# Statements are built once at import time; tasks only bind parameter values.
+ACCOUNT_IDS_FOR_USER = select(EmailAccount.id).where(
+    EmailAccount.user_id == bindparam("user_id")
+)
+EMAIL_FOR_USER = select(Email).where(
+    Email.id == bindparam("email_id"),
+    Email.account_id.in_(ACCOUNT_IDS_FOR_USER.scalar_subquery()),
+)
+DOCUMENT_FOR_USER = select(Document).where(
+    Document.id == bindparam("document_id"),
+    Document.user_id == bindparam("user_id"),
+)
+MEETING_FOR_USER = select(Meeting).where(
+    Meeting.id == bindparam("meeting_id"),
+    Meeting.user_id == bindparam("user_id"),
+)
+EMAIL_IDS_FOR_USER = select(Email.id).where(
+    Email.account_id.in_(ACCOUNT_IDS_FOR_USER.scalar_subquery())
+)
+DOCUMENT_IDS_FOR_USER = select(Document.id).where(Document.user_id == bindparam("user_id"))
+MEETING_IDS_FOR_USER = select(Meeting.id).where(Meeting.user_id == bindparam("user_id"))
 
 
 def get_async_session():
@@ -14,13 +61,141 @@ def get_async_session():
 
 
 def run_async(coro):
-    """Run async function in sync context."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    """Run async function on the worker process event loop."""
+    return get_worker_loop().run_until_complete(coro)
+
+
+def _index_key(entity_type: str, entity_id: str) -> str:
+    """Redis key marking an indexing task as in flight."""
+    return f"idx:{entity_type}:{entity_id}"
+
+
+def enqueue_index(entity_type: str, entity_id: str, user_id: str) -> bool:
+    """Queue indexing for an email, document or meeting unless already queued."""
+    task = {
+        "email": index_email,
+        "document": index_document,
+        "meeting": index_meeting,
+    }[entity_type]
+
+    if not get_redis().set(
+        _index_key(entity_type, entity_id), "1", nx=True, ex=INDEX_DEDUPE_TTL_SECONDS
+    ):
+        return False
+
+    task.delay(entity_id, user_id)
+    return True
+
+
+def _release_index(entity_type: str, entity_id: str) -> None:
+    """Allow the entity to be queued for indexing again."""
+    try:
+        get_redis().delete(_index_key(entity_type, entity_id))
+    except Exception:
+        pass
+
+
+def _hold_index(entity_type: str, entity_id: str) -> None:
+    """Keep the in-flight key alive until a scheduled retry has run."""
+    try:
+        get_redis().expire(
+            _index_key(entity_type, entity_id),
+            INDEX_RETRY_COUNTDOWN_SECONDS + INDEX_DEDUPE_TTL_SECONDS,
+        )
+    except Exception:
+        pass
+
+
+def _run_index_task(entity_type: str, entity_id: str, coro):
+    """Run an indexing coroutine, releasing its key only once the task is finished."""
     try:
-        return loop.run_until_complete(coro)
+        result = run_async(coro)
+    except Retry:
+        _hold_index(entity_type, entity_id)
+        raise
+    except BaseException:
+        _release_index(entity_type, entity_id)
+        raise
+    _release_index(entity_type, entity_id)
+    return result
+
+
+def _extract_pdf(path: str) -> Tuple[str, int]:
+    """Extract text and page count from a PDF file (blocking)."""
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(path)
+    try:
+        parts = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            parts.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+        return "\n".join(parts), len(pdf)
     finally:
-        loop.close()
+        pdf.close()
+
+
+def _extract_docx(path: str) -> str:
+    """Stream paragraph text out of a DOCX file's main document part (blocking)."""
+    import zipfile
+
+    from lxml import etree
+
+    w = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+    paragraphs = []
+
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as part:
+        for _, paragraph in etree.iterparse(part, tag=f"{w}p"):
+            text = []
+            for node in paragraph.iter(f"{w}t", f"{w}tab", f"{w}br", f"{w}cr"):
+                if node.tag == f"{w}t":
+                    text.append(node.text or "")
+                elif node.tag == f"{w}tab":
+                    text.append("\t")
+                else:
+                    text.append("\n")
+            paragraphs.append("".join(text))
+            paragraph.clear()
+
+    return "\n".join(paragraphs)
+
+
+def _count_words(text: str) -> int:
+    """Count whitespace-separated words without building a word list."""
+    return sum(1 for _ in _WORD_RE.finditer(text))
+
+
+async def _extract_txt(path: str) -> Tuple[str, int]:
+    """Stream a UTF-8 text file, counting words as it is read."""
+    import codecs
+
+    import aiofiles
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parts = []
+    word_count = 0
+    in_word = False
+
+    async with aiofiles.open(path, "rb") as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+        while True:
+            data = await f.read(TXT_READ_CHUNK_SIZE)
+            chunk = decoder.decode(data, final=not data)
+            if chunk:
+                parts.append(chunk)
+                word_count += _count_words(chunk)
+                # A word split across the chunk boundary was counted twice
+                if in_word and not chunk[0].isspace():
+                    word_count -= 1
+                in_word = not chunk[-1].isspace()
+            if not data:
+                break
+
+    return "".join(parts), word_count
 
 
 @celery_app.task(bind=True, max_retries=3)
@@ -28,25 +203,12 @@ def index_email(self, email_id: str, user_id: str):
     """Index an email in the knowledge graph."""
 
     async def _index():
-        from sqlalchemy import select
-
-        from app.models.email import Email
-        from app.models.email_account import EmailAccount
-        from app.services.rag_service import RAGService
-
         async with get_async_session() as db:
             try:
                 # Get email
-                accounts_result = await db.execute(
-                    select(EmailAccount.id).where(EmailAccount.user_id == UUID(user_id))
-                )
-                account_ids = [row[0] for row in accounts_result.fetchall()]
-
                 result = await db.execute(
-                    select(Email).where(
-                        Email.id == UUID(email_id),
-                        Email.account_id.in_(account_ids),
-                    )
+                    EMAIL_FOR_USER,
+                    {"email_id": UUID(email_id), "user_id": UUID(user_id)},
                 )
                 email = result.scalar_one_or_none()
 
@@ -57,9 +219,7 @@ def index_email(self, email_id: str, user_id: str):
                     return {"status": "skipped", "message": "Already indexed"}
 
                 # Index email
-                rag_service = RAGService(db)
-                success = await rag_service.index_email(email, UUID(user_id))
-                await rag_service.close()
+                success = await get_rag_service().index_email(email, UUID(user_id), db)
 
                 if success:
                     return {
@@ -73,9 +233,9 @@ def index_email(self, email_id: str, user_id: str):
                     }
 
             except Exception as e:
-                raise self.retry(exc=e, countdown=30)
+                raise self.retry(exc=e, countdown=INDEX_RETRY_COUNTDOWN_SECONDS)
 
-    return run_async(_index())
+    return _run_index_task("email", email_id, _index())
 
 
 @celery_app.task(bind=True, max_retries=3)
@@ -83,19 +243,12 @@ def index_document(self, document_id: str, user_id: str):
     """Index a document in the knowledge graph."""
 
     async def _index():
-        from sqlalchemy import select
-
-        from app.models.document import Document
-        from app.services.rag_service import RAGService
-
         async with get_async_session() as db:
             try:
                 # Get document
                 result = await db.execute(
-                    select(Document).where(
-                        Document.id == UUID(document_id),
-                        Document.user_id == UUID(user_id),
-                    )
+                    DOCUMENT_FOR_USER,
+                    {"document_id": UUID(document_id), "user_id": UUID(user_id)},
                 )
                 document = result.scalar_one_or_none()
 
@@ -106,9 +259,7 @@ def index_document(self, document_id: str, user_id: str):
                     return {"status": "skipped", "message": "Already indexed"}
 
                 # Index document
-                rag_service = RAGService(db)
-                success = await rag_service.index_document(document, UUID(user_id))
-                await rag_service.close()
+                success = await get_rag_service().index_document(document, UUID(user_id), db)
 
                 if success:
                     return {
@@ -122,9 +273,9 @@ def index_document(self, document_id: str, user_id: str):
                     }
 
             except Exception as e:
-                raise self.retry(exc=e, countdown=30)
+                raise self.retry(exc=e, countdown=INDEX_RETRY_COUNTDOWN_SECONDS)
 
-    return run_async(_index())
+    return _run_index_task("document", document_id, _index())
 
 
 @celery_app.task(bind=True, max_retries=3)
@@ -132,19 +283,12 @@ def index_meeting(self, meeting_id: str, user_id: str):
     """Index a meeting in the knowledge graph."""
 
     async def _index():
-        from sqlalchemy import select
-
-        from app.models.meeting import Meeting
-        from app.services.rag_service import RAGService
-
         async with get_async_session() as db:
             try:
                 # Get meeting
                 result = await db.execute(
-                    select(Meeting).where(
-                        Meeting.id == UUID(meeting_id),
-                        Meeting.user_id == UUID(user_id),
-                    )
+                    MEETING_FOR_USER,
+                    {"meeting_id": UUID(meeting_id), "user_id": UUID(user_id)},
                 )
                 meeting = result.scalar_one_or_none()
 
@@ -155,9 +299,7 @@ def index_meeting(self, meeting_id: str, user_id: str):
                     return {"status": "skipped", "message": "Already indexed"}
 
                 # Index meeting
-                rag_service = RAGService(db)
-                success = await rag_service.index_meeting(meeting, UUID(user_id))
-                await rag_service.close()
+                success = await get_rag_service().index_meeting(meeting, UUID(user_id), db)
 
                 if success:
                     return {
@@ -171,9 +313,9 @@ def index_meeting(self, meeting_id: str, user_id: str):
                     }
 
             except Exception as e:
-                raise self.retry(exc=e, countdown=30)
+                raise self.retry(exc=e, countdown=INDEX_RETRY_COUNTDOWN_SECONDS)
 
-    return run_async(_index())
+    return _run_index_task("meeting", meeting_id, _index())
 
 
 @celery_app.task
@@ -181,45 +323,28 @@ def reindex_all(user_id: str):
     """Reindex all content for a user."""
 
     async def _reindex():
-        from sqlalchemy import select
-
-        from app.models.document import Document
-        from app.models.email import Email
-        from app.models.email_account import EmailAccount
-        from app.models.meeting import Meeting
+        params = {"user_id": UUID(user_id)}
 
         async with get_async_session() as db:
             queued = {"emails": 0, "documents": 0, "meetings": 0}
 
             # Queue emails
-            accounts_result = await db.execute(
-                select(EmailAccount.id).where(EmailAccount.user_id == UUID(user_id))
-            )
-            account_ids = [row[0] for row in accounts_result.fetchall()]
-
-            if account_ids:
-                emails_result = await db.execute(
-                    select(Email.id).where(Email.account_id.in_(account_ids))
-                )
-                for row in emails_result.fetchall():
-                    index_email.delay(str(row[0]), user_id)
+            emails_result = await db.execute(EMAIL_IDS_FOR_USER, params)
+            for row in emails_result.fetchall():
+                if enqueue_index("email", str(row[0]), user_id):
                     queued["emails"] += 1
 
             # Queue documents
-            docs_result = await db.execute(
-                select(Document.id).where(Document.user_id == UUID(user_id))
-            )
+            docs_result = await db.execute(DOCUMENT_IDS_FOR_USER, params)
             for row in docs_result.fetchall():
-                index_document.delay(str(row[0]), user_id)
-                queued["documents"] += 1
+                if enqueue_index("document", str(row[0]), user_id):
+                    queued["documents"] += 1
 
             # Queue meetings
-            meetings_result = await db.execute(
-                select(Meeting.id).where(Meeting.user_id == UUID(user_id))
-            )
+            meetings_result = await db.execute(MEETING_IDS_FOR_USER, params)
             for row in meetings_result.fetchall():
-                index_meeting.delay(str(row[0]), user_id)
-                queued["meetings"] += 1
+                if enqueue_index("meeting", str(row[0]), user_id):
+                    queued["meetings"] += 1
 
             return queued
 
@@ -231,19 +356,13 @@ def extract_document_content(document_id: str, user_id: str):
     """Extract text content from a document."""
 
     async def _extract():
-        import os
-
-        from sqlalchemy import select
-
-        from app.models.document import Document
+        from app.services.llm_service import truncate_to_tokens
 
         async with get_async_session() as db:
             # Get document
             result = await db.execute(
-                select(Document).where(
-                    Document.id == UUID(document_id),
-                    Document.user_id == UUID(user_id),
-                )
+                DOCUMENT_FOR_USER,
+                {"document_id": UUID(document_id), "user_id": UUID(user_id)},
             )
             document = result.scalar_one_or_none()
 
@@ -254,27 +373,20 @@ def extract_document_content(document_id: str, user_id: str):
                 return {"status": "error", "message": "File not found"}
 
             content_text = None
+            word_count: Optional[int] = None
 
             # Extract based on file type
             if document.file_type == "pdf":
                 try:
-                    import pypdf
-
-                    with open(document.file_path, "rb") as f:
-                        reader = pypdf.PdfReader(f)
-                        content_text = ""
-                        for page in reader.pages:
-                            content_text += page.extract_text() + "\n"
-                        document.page_count = len(reader.pages)
+                    content_text, document.page_count = await asyncio.to_thread(
+                        _extract_pdf, document.file_path
+                    )
                 except Exception as e:
                     return {"status": "error", "message": f"PDF extraction failed: {e}"}
 
             elif document.file_type == "docx":
                 try:
-                    from docx import Document as DocxDocument
-
-                    doc = DocxDocument(document.file_path)
-                    content_text = "\n".join([p.text for p in doc.paragraphs])
+                    content_text = await asyncio.to_thread(_extract_docx, document.file_path)
                 except Exception as e:
                     return {
                         "status": "error",
@@ -283,23 +395,23 @@ def extract_document_content(document_id: str, user_id: str):
 
             elif document.file_type == "txt":
                 try:
-                    with open(document.file_path, "r", encoding="utf-8") as f:
-                        content_text = f.read()
+                    content_text, word_count = await _extract_txt(document.file_path)
                 except Exception as e:
                     return {"status": "error", "message": f"TXT extraction failed: {e}"}
 
             if content_text:
                 document.content_text = content_text
-                document.word_count = len(content_text.split())
+                document.word_count = (
+                    word_count if word_count is not None else _count_words(content_text)
+                )
 
                 # Generate summary using LLM
-                from app.services.llm_service import LLMService
-
-                llm_service = LLMService()
-
                 try:
-                    summary = await llm_service.generate(
-                        prompt=f"Summarize this document in 2-3 sentences:\n\n{content_text[:3000]}",
+                    summary = await get_llm_service().generate(
+                        prompt=(
+                            "Summarize this document in 2-3 sentences:\n\n"
+                            f"{truncate_to_tokens(content_text, SUMMARY_PROMPT_MAX_TOKENS)}"
+                        ),
                         max_tokens=200,
                     )
                     document.content_summary = summary
@@ -309,7 +421,7 @@ def extract_document_content(document_id: str, user_id: str):
                 await db.commit()
 
                 # Trigger indexing
-                index_document.delay(document_id, user_id)
+                enqueue_index("document", document_id, user_id)
 
                 return {
                     "status": "success",
@@ -1,10 +1,16 @@
 """Transcription-related Celery tasks."""
 
-import asyncio
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import UUID
 
-from app.workers.celery_app import celery_app
+from app.workers.celery_app import (
+    celery_app,
+    get_llm_service,
+    get_transcription_service,
+    get_worker_loop,
+)
+
+_UTC = timezone.utc
 
 
 def get_async_session():
@@ -15,13 +21,8 @@ def get_async_session():
 
 
 def run_async(coro):
-    """Run async function in sync context."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+    """Run async function on the worker process event loop."""
+    return get_worker_loop().run_until_complete(coro)
 
 
 @celery_app.task(bind=True, max_retries=2)
@@ -35,52 +36,60 @@ def transcribe_meeting(
     """Transcribe meeting audio."""
 
     async def _transcribe():
-        from sqlalchemy import select
+        from sqlalchemy import update
 
         from app.models.audit_log import AuditLog
         from app.models.meeting import Meeting
-        from app.services.transcription_service import TranscriptionService
+
+        meeting_filter = (
+            Meeting.id == UUID(meeting_id),
+            Meeting.user_id == UUID(user_id),
+        )
 
         async with get_async_session() as db:
+            claimed = False
             try:
-                # Get meeting
-                result = await db.execute(
-                    select(Meeting).where(
-                        Meeting.id == UUID(meeting_id),
-                        Meeting.user_id == UUID(user_id),
-                    )
+                # Mark as transcribing and fetch what we need in one round-trip
+                claim = await db.execute(
+                    update(Meeting)
+                    .where(*meeting_filter, Meeting.audio_file_path.is_not(None))
+                    .values(status="transcribing")
+                    .returning(Meeting.audio_file_path, Meeting.title)
                 )
-                meeting = result.scalar_one_or_none()
-
-                if not meeting:
-                    return {"status": "error", "message": "Meeting not found"}
+                row = claim.one_or_none()
 
-                if not meeting.audio_file_path:
-                    return {"status": "error", "message": "No audio file"}
+                if not row:
+                    return {
+                        "status": "error",
+                        "message": "Meeting not found or has no audio file",
+                    }
 
-                # Update status
-                meeting.status = "transcribing"
+                audio_file_path, meeting_title = row
                 await db.commit()
+                claimed = True
 
                 # Transcribe
-                transcription_service = TranscriptionService(model_size=model)
-                result = await transcription_service.transcribe(
-                    meeting.audio_file_path,
+                result = await get_transcription_service(model).transcribe(
+                    audio_file_path,
                     language=language if language != "auto" else None,
                 )
 
-                # Update meeting
-                meeting.transcript = result["text"]
-                meeting.transcript_language = result["language"]
-                meeting.transcription_model = f"whisper-{model}"
-                meeting.transcription_time_seconds = result[
-                    "transcription_time_seconds"
-                ]
-                meeting.audio_duration_seconds = result["duration_seconds"]
-                meeting.status = "transcribed"
-                meeting.transcribed_at = datetime.utcnow()
+                # Update meeting and write the audit log in a single transaction
+                now = datetime.now(_UTC)
+                await db.execute(
+                    update(Meeting)
+                    .where(*meeting_filter)
+                    .values(
+                        transcript=result["text"],
+                        transcript_language=result["language"],
+                        transcription_model=f"whisper-{model}",
+                        transcription_time_seconds=result["transcription_time_seconds"],
+                        audio_duration_seconds=result["duration_seconds"],
+                        status="transcribed",
+                        transcribed_at=now,
+                    )
+                )
 
-                # Create audit log
                 audit_log = AuditLog(
                     user_id=UUID(user_id),
                     action="meeting_transcription",
@@ -94,29 +103,30 @@ def transcribe_meeting(
                         ],
                     },
                     status="success",
+                    created_at=now,
                 )
                 db.add(audit_log)
-                await db.commit()
-
-                # Trigger summarization
-                summarize_meeting.delay(meeting_id, user_id)
 
-                # Trigger indexing
-                from app.workers.tasks.rag_tasks import index_meeting
-
-                index_meeting.delay(meeting_id, user_id)
+                await db.commit()
 
-                # Send notification
+                # Notify only once the transcript is saved
                 from app.workers.tasks.notification_tasks import send_notification
 
                 send_notification.delay(
                     user_id,
                     "transcription_complete",
                     {
-                        "meeting_title": meeting.title,
+                        "meeting_title": meeting_title,
                     },
                 )
 
+                # Summarization and indexing read the committed transcript
+                summarize_meeting.delay(meeting_id, user_id)
+
+                from app.workers.tasks.rag_tasks import enqueue_index
+
+                enqueue_index("meeting", meeting_id, user_id)
+
                 return {
                     "status": "success",
                     "meeting_id": meeting_id,
@@ -125,10 +135,13 @@ def transcribe_meeting(
                 }
 
             except Exception as e:
+                await db.rollback()
+
                 # Update status to error
-                if meeting:
-                    meeting.status = "error"
-                    await db.commit()
+                if claimed:
+                    await db.execute(
+                        update(Meeting).where(*meeting_filter).values(status="error")
+                    )
 
                 # Log error
                 audit_log = AuditLog(
@@ -156,7 +169,6 @@ def summarize_meeting(self, meeting_id: str, user_id: str, language: str = None)
 
         from app.models.audit_log import AuditLog
         from app.models.meeting import Meeting
-        from app.services.llm_service import LLMService
 
         async with get_async_session() as db:
             try:
@@ -176,19 +188,19 @@ def summarize_meeting(self, meeting_id: str, user_id: str, language: str = None)
                     return {"status": "error", "message": "No transcript available"}
 
                 # Summarize using LLM
-                llm_service = LLMService()
-                summary_result = await llm_service.summarize_meeting(
+                summary_result = await get_llm_service().summarize_meeting(
                     transcript=meeting.transcript,
                     language=language or meeting.transcript_language or "en",
                 )
 
                 # Update meeting
+                now = datetime.now(_UTC)
                 meeting.summary = summary_result.get("summary", "")
                 meeting.action_items = summary_result.get("action_items", [])
                 meeting.key_decisions = summary_result.get("key_decisions", [])
                 meeting.topics = summary_result.get("topics", [])
                 meeting.status = "summarized"
-                meeting.summarized_at = datetime.utcnow()
+                meeting.summarized_at = now
 
                 # Create audit log
                 audit_log = AuditLog(
@@ -201,11 +213,13 @@ def summarize_meeting(self, meeting_id: str, user_id: str, language: str = None)
                         "key_decisions_count": len(meeting.key_decisions or []),
                     },
                     status="success",
+                    created_at=now,
                 )
                 db.add(audit_log)
+
                 await db.commit()
 
-                # Send notification
+                # Notify only once the summary is saved
                 from app.workers.tasks.notification_tasks import send_notification
 
                 send_notification.delay(
@@ -244,7 +258,10 @@ def summarize_meeting(self, meeting_id: str, user_id: str, language: str = None)
 @celery_app.task
 def batch_transcribe_meetings(user_id: str, meeting_ids: list):
     """Batch transcribe multiple meetings."""
-    for meeting_id in meeting_ids:
-        transcribe_meeting.delay(meeting_id, user_id)
+    from celery import group
+
+    job = group(transcribe_meeting.s(meeting_id, user_id) for meeting_id in meeting_ids)
+    result = job.apply_async()
+    result.save()
 
-    return {"queued_meetings": len(meeting_ids)}
+    return {"queued_meetings": len(meeting_ids), "group_id": result.id}
@@ -3,11 +3,107 @@ Performance benchmarks for OpenFyxer.
 Measures processing times for critical operations.
 """
 
+import asyncio
 import pytest
-import time
-import statistics
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from functools import lru_cache
 from unittest.mock import AsyncMock, MagicMock
-from datetime import datetime
+
+import numpy as np
+from sqlalchemy import func, insert, select
+
+from app.db.session import get_db
+from app.main import app
+from app.models.document import Document
+from app.models.email import Email
+from app.models.email_account import EmailAccount
+from app.models.meeting import Meeting
+from app.models.user import User
+from app.services.llm_service import LLMService
+from app.services.rag_service import RAGService
+
+
+SAMPLE_EMAIL = {
+    "subject": "Urgent: Project deadline tomorrow",
+    "body": "Please complete the project by tomorrow. This is very important.",
+    "sender": "boss@company.com",
+}
+CLASSIFICATION_RESPONSE = (
+    'Sure. {"category": "urgent", "language": "en", "sentiment": "neutral", '
+    '"priority_score": 0.9}'
+)
+DRAFT_RESPONSE = "Thank you for your email. I will complete the project by tomorrow."
+LIST_ENDPOINTS = [
+    "/api/v1/emails",
+    "/api/v1/calendar/events",
+    "/api/v1/meetings",
+    "/api/v1/rag/documents",
+]
+EMAIL_CATEGORIES = ["urgent", "to_respond", "fyi", "newsletter", "spam"]
+SEED_ROWS = 200
+
+
+def _canned(response: str):
+    """Async stand-in for LLMService.generate that returns ``response`` without a model call."""
+
+    async def generate(*args, **kwargs):
+        return response
+
+    return generate
+
+
+@pytest.fixture
+async def seeded_db(db_session, test_user):
+    """Test user with an email account plus a few hundred emails, documents and meetings."""
+    user_id = uuid.UUID(test_user["id"])
+    account = EmailAccount(user_id=user_id, provider="imap", email_address=test_user["email"])
+    db_session.add_all(
+        [
+            User(
+                id=user_id,
+                email=test_user["email"],
+                full_name=test_user["full_name"],
+                hashed_password=test_user["hashed_password"],
+                is_active=True,
+            ),
+            account,
+        ]
+    )
+    await db_session.flush()
+
+    received_at = datetime(2024, 1, 1)
+    db_session.add_all(
+        Email(
+            account_id=account.id,
+            message_id=f"<seed-{i}@example.com>",
+            subject=f"Project update {i}",
+            sender=f"colleague{i % 20}@company.com",
+            body_text=f"Status report {i}. The project deadline moved to week {i % 52}.",
+            category=EMAIL_CATEGORIES[i % len(EMAIL_CATEGORIES)],
+            received_at=received_at + timedelta(minutes=i),
+        )
+        for i in range(SEED_ROWS)
+    )
+    db_session.add_all(
+        Document(
+            user_id=user_id,
+            filename=f"report-{i}.txt",
+            content_text=f"Quarterly report {i}. Budget review and project deadline notes.",
+        )
+        for i in range(SEED_ROWS // 4)
+    )
+    db_session.add_all(
+        Meeting(
+            user_id=user_id,
+            title=f"Project sync {i}",
+            transcript=f"We discussed the project deadline and action items for sprint {i}.",
+        )
+        for i in range(SEED_ROWS // 4)
+    )
+    await db_session.commit()
+    return db_session
 
 
 class TestEmailProcessingPerformance:
@@ -15,343 +111,426 @@ class TestEmailProcessingPerformance:
 
     @pytest.fixture
     def mock_llm_service(self):
-        """Create mock LLM service with simulated latency."""
+        """Create mock LLM service that yields to the event loop without added latency."""
         mock = MagicMock()
 
         async def simulate_classification(*args, **kwargs):
-            await asyncio.sleep(0.1)
+            await asyncio.sleep(0)
             return "urgent"
 
         async def simulate_draft_generation(*args, **kwargs):
-            await asyncio.sleep(0.5)
+            await asyncio.sleep(0)
             return "Generated draft response."
 
         mock.classify_email = AsyncMock(side_effect=simulate_classification)
         mock.generate_draft = AsyncMock(side_effect=simulate_draft_generation)
         return mock
 
-    def test_email_classification_time(self):
-        """Benchmark email classification time."""
-        iterations = 10
-        times = []
+    @pytest.fixture
+    def llm_service(self):
+        """LLM service whose model call returns canned output, so only our own code is timed."""
+        return LLMService()
+
+    def test_email_classification_time(self, benchmark, session_event_loop, llm_service):
+        """Benchmark uncached email classification: prompt building and response parsing."""
+        llm_service.generate = _canned(CLASSIFICATION_RESPONSE)
+
+        result = benchmark.pedantic(
+            lambda: session_event_loop.run_until_complete(
+                llm_service.classify_email(**SAMPLE_EMAIL)
+            ),
+            setup=llm_service._classification_cache.clear,
+            rounds=200,
+        )
+
+        assert result["category"] == "urgent"
+        if benchmark.stats:
+            assert benchmark.stats.stats.median < 0.5, "Classification too slow"
+
+    def test_draft_generation_time(self, benchmark, session_event_loop, llm_service):
+        """Benchmark draft generation: system prompt and request assembly."""
+        llm_service.generate = _canned(DRAFT_RESPONSE)
+        user_style = {
+            "common_greetings": ["Hi", "Hello"],
+            "common_closings": ["Best regards"],
+            "signature": "Test User",
+        }
 
-        for _ in range(iterations):
-            start = time.perf_counter()
-            self._simulate_classification()
-            end = time.perf_counter()
-            times.append(end - start)
+        result = benchmark(
+            lambda: session_event_loop.run_until_complete(
+                llm_service.generate_email_draft(SAMPLE_EMAIL, user_style=user_style)
+            )
+        )
 
-        avg_time = statistics.mean(times)
-        max_time = max(times)
+        assert result == DRAFT_RESPONSE
+        if benchmark.stats:
+            assert benchmark.stats.stats.median < 5.0, "Draft generation too slow"
 
-        print(f"\nEmail Classification Benchmark:")
-        print(f"  Average time: {avg_time * 1000:.2f}ms")
-        print(f"  Max time: {max_time * 1000:.2f}ms")
-        print(f"  Iterations: {iterations}")
+    @pytest.mark.parametrize("count", [10, 50, 100])
+    def test_batch_email_processing_time(
+        self, benchmark, session_event_loop, mock_llm_service, count
+    ):
+        """Benchmark batch email processing."""
+        benchmark.extra_info["ops"] = count
+        results = benchmark.pedantic(
+            lambda: session_event_loop.run_until_complete(
+                self._batch_classify(mock_llm_service, count)
+            ),
+            rounds=5,
+            iterations=1,
+        )
 
-        assert avg_time < 0.5, f"Classification too slow: {avg_time}s"
+        assert results == ["urgent"] * count
+        if benchmark.stats:
+            assert benchmark.stats.stats.median < 10.0, "Batch processing too slow"
 
-    def _simulate_classification(self):
-        """Simulate email classification."""
-        time.sleep(0.05)
-        return "urgent"
+    async def _batch_classify(self, llm_service, count: int):
+        """Classify a batch of emails concurrently."""
+        return await asyncio.gather(
+            *(llm_service.classify_email(f"Email {i}") for i in range(count))
+        )
 
-    def test_draft_generation_time(self):
-        """Benchmark draft generation time."""
-        iterations = 5
-        times = []
 
-        for _ in range(iterations):
-            start = time.perf_counter()
-            self._simulate_draft_generation()
-            end = time.perf_counter()
-            times.append(end - start)
+EMBEDDING_DIM = 384
+VECTOR_CORPUS_SIZES = [100, 1000, 10000]
+INDEX_CHUNK_SIZE = 500
+HNSW_EF_SEARCH = 64
 
-        avg_time = statistics.mean(times)
-        max_time = max(times)
 
-        print(f"\nDraft Generation Benchmark:")
-        print(f"  Average time: {avg_time * 1000:.2f}ms")
-        print(f"  Max time: {max_time * 1000:.2f}ms")
-        print(f"  Iterations: {iterations}")
+@pytest.fixture(scope="session")
+def vector_indices():
+    """Build one HNSW index per corpus size with held-out queries and exact top-10 neighbours."""
+    hnswlib = pytest.importorskip("hnswlib")
 
-        assert avg_time < 5.0, f"Draft generation too slow: {avg_time}s"
+    rng = np.random.default_rng(0)
+    # Embeddings cluster around topics; uniform noise would understate achievable recall
+    topics = rng.standard_normal((64, EMBEDDING_DIM), dtype=np.float32)
 
-    def _simulate_draft_generation(self):
-        """Simulate draft generation."""
-        time.sleep(0.2)
-        return "Generated draft response."
+    def sample(count):
+        noise = rng.standard_normal((count, EMBEDDING_DIM), dtype=np.float32)
+        return topics[rng.integers(0, len(topics), count)] + 0.5 * noise
 
-    def test_batch_email_processing_time(self):
-        """Benchmark batch email processing."""
-        email_counts = [10, 50, 100]
+    def normalize(vectors):
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
 
-        for count in email_counts:
-            start = time.perf_counter()
-            self._simulate_batch_processing(count)
-            end = time.perf_counter()
+    indices = {}
+    for size in VECTOR_CORPUS_SIZES:
+        corpus = sample(size)
+        queries = sample(100)
 
-            total_time = end - start
-            per_email_time = total_time / count
+        index = hnswlib.Index(space="cosine", dim=EMBEDDING_DIM)
+        index.init_index(max_elements=size, ef_construction=200, M=16)
+        index.add_items(corpus)
+        index.set_ef(HNSW_EF_SEARCH)
 
-            print(f"\nBatch Processing ({count} emails):")
-            print(f"  Total time: {total_time * 1000:.2f}ms")
-            print(f"  Per email: {per_email_time * 1000:.2f}ms")
+        scores = normalize(queries) @ normalize(corpus).T
+        ground_truth = np.argpartition(-scores, 10, axis=1)[:, :10]
+        indices[size] = (index, queries, ground_truth)
 
-    def _simulate_batch_processing(self, count: int):
-        """Simulate batch email processing."""
-        for _ in range(count):
-            time.sleep(0.01)
+    return indices
+
+
+def recall_at_10(labels, ground_truth) -> float:
+    """Mean fraction of the exact top-10 neighbours returned per query."""
+    hits = sum(len(set(found) & set(truth)) for found, truth in zip(labels, ground_truth))
+    return hits / (10 * len(ground_truth))
 
 
 class TestRAGPerformance:
     """Performance benchmarks for RAG operations."""
 
-    def test_rag_query_time(self):
-        """Benchmark RAG query response time."""
-        iterations = 10
-        times = []
-
-        for _ in range(iterations):
-            start = time.perf_counter()
-            self._simulate_rag_query()
-            end = time.perf_counter()
-            times.append(end - start)
-
-        avg_time = statistics.mean(times)
-        max_time = max(times)
-        p95_time = sorted(times)[int(len(times) * 0.95)]
-
-        print(f"\nRAG Query Benchmark:")
-        print(f"  Average time: {avg_time * 1000:.2f}ms")
-        print(f"  Max time: {max_time * 1000:.2f}ms")
-        print(f"  P95 time: {p95_time * 1000:.2f}ms")
-        print(f"  Iterations: {iterations}")
-
-        assert avg_time < 2.0, f"RAG query too slow: {avg_time}s"
-
-    def _simulate_rag_query(self):
-        """Simulate RAG query."""
-        time.sleep(0.1)
-        return {
-            "answer": "The project deadline is December 15th.",
-            "sources": [],
-            "confidence": 0.9,
-        }
+    def test_rag_query_time(self, benchmark, session_event_loop, seeded_db, test_user):
+        """Benchmark the database-backed RAG search used when the graph store is unavailable."""
+        rag_service = RAGService(llm_service=LLMService())
+        user_id = uuid.UUID(test_user["id"])
 
-    def test_document_indexing_time(self):
-        """Benchmark document indexing time."""
-        document_sizes = [
-            ("small", 1000),
-            ("medium", 10000),
-            ("large", 100000),
+        result = benchmark(
+            lambda: session_event_loop.run_until_complete(
+                rag_service._fallback_search("project deadline", user_id, seeded_db, 10)
+            )
+        )
+
+        assert len(result["sources"]) == 10
+        if benchmark.stats:
+            assert benchmark.stats.stats.median < 2.0, "RAG query too slow"
+
+    @pytest.fixture
+    def cached_rag_search(self, vector_indices):
+        """Embed-and-search RAG path behind per-test exact-match LRU caches."""
+        index = vector_indices[VECTOR_CORPUS_SIZES[-1]][0]
+
+        @lru_cache(maxsize=1000)
+        def embed(query: str):
+            rng = np.random.default_rng(zlib.crc32(query.encode()))
+            return rng.standard_normal(EMBEDDING_DIM, dtype=np.float32)
+
+        @lru_cache(maxsize=1000)
+        def search(query: str):
+            labels, _ = index.knn_query(embed(query), k=10)
+            return tuple(labels[0])
+
+        return search
+
+    @pytest.fixture
+    def zipf_queries(self):
+        """Skewed query stream where a few questions dominate, as in real assistant traffic."""
+        ranks = np.random.default_rng(0).zipf(1.2, 1000) % 100
+        return [f"What is the status of project {rank}?" for rank in ranks]
+
+    @pytest.mark.parametrize("path", ["hit", "miss"])
+    def test_rag_query_cache_hit_time(self, benchmark, cached_rag_search, zipf_queries, path):
+        """Benchmark cached versus uncached RAG query latency."""
+        query = zipf_queries[0]
+        cached_rag_search(query)
+
+        def setup():
+            if path == "miss":
+                cached_rag_search.cache_clear()
+            return (query,), {}
+
+        benchmark.group = "rag-query-cache"
+        result = benchmark.pedantic(cached_rag_search, setup=setup, rounds=100)
+
+        assert len(result) == 10
+
+    def test_rag_query_cache_hit_rate(self, benchmark, cached_rag_search, zipf_queries):
+        """Benchmark a skewed query stream and report the cache hit rate."""
+
+        def run_stream():
+            cached_rag_search.cache_clear()
+            for query in zipf_queries:
+                cached_rag_search(query)
+            return cached_rag_search.cache_info()
+
+        info = benchmark.pedantic(run_stream, rounds=5, iterations=1)
+        hit_rate = info.hits / (info.hits + info.misses)
+        benchmark.extra_info.update(hits=info.hits, misses=info.misses, hit_rate=hit_rate)
+
+        assert hit_rate > 0.8, f"Query cache hit rate too low: {hit_rate:.2f}"
+
+    @pytest.mark.parametrize("impl", ["python", "numpy"])
+    @pytest.mark.parametrize("size", [1000, 10000, 100000], ids=["small", "medium", "large"])
+    def test_document_indexing_time(self, benchmark, size, impl):
+        """Benchmark document chunking and batched embedding."""
+        content = "x" * size
+        index = self._index_numpy if impl == "numpy" else self._index_python
+
+        benchmark.group = f"document-indexing-{size}"
+        embeddings = benchmark(index, content)
+
+        assert embeddings.shape == (-(-size // INDEX_CHUNK_SIZE), EMBEDDING_DIM)
+
+    def _fake_embed_batch(self, chunks, batch: int = 64):
+        """Embed chunks in fixed-size batches with one RNG call per batch."""
+        rng = np.random.default_rng(0)
+        return np.concatenate(
+            [
+                rng.standard_normal((len(chunks[i:i + batch]), EMBEDDING_DIM), dtype=np.float32)
+                for i in range(0, len(chunks), batch)
+            ]
+        )
+
+    def _index_python(self, content: str):
+        """Chunk with string slicing and embed one chunk at a time."""
+        rng = np.random.default_rng(0)
+        chunks = [
+            content[i:i + INDEX_CHUNK_SIZE] for i in range(0, len(content), INDEX_CHUNK_SIZE)
         ]
+        return np.stack([rng.standard_normal(EMBEDDING_DIM, dtype=np.float32) for _ in chunks])
 
-        for name, size in document_sizes:
-            content = "x" * size
-            start = time.perf_counter()
-            self._simulate_indexing(content)
-            end = time.perf_counter()
+    def _index_numpy(self, content: str):
+        """Chunk by reshaping the padded byte buffer and embed in batches."""
+        data = np.frombuffer(content.encode(), dtype=np.uint8)
+        padded = np.zeros(-(-len(data) // INDEX_CHUNK_SIZE) * INDEX_CHUNK_SIZE, dtype=np.uint8)
+        padded[: len(data)] = data
+        chunks = padded.reshape(-1, INDEX_CHUNK_SIZE)
+        return self._fake_embed_batch(chunks)
 
-            print(f"\nDocument Indexing ({name}, {size} chars):")
-            print(f"  Time: {(end - start) * 1000:.2f}ms")
+    @pytest.mark.parametrize("corpus_size", VECTOR_CORPUS_SIZES)
+    def test_vector_search_scaling(self, benchmark, vector_indices, corpus_size):
+        """Benchmark approximate vector search with different corpus sizes."""
+        index, queries, ground_truth = vector_indices[corpus_size]
 
-    def _simulate_indexing(self, content: str):
-        """Simulate document indexing."""
-        chunk_size = 500
-        chunks = [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]
-        for _ in chunks:
-            time.sleep(0.001)
+        benchmark(index.knn_query, queries[:1], k=10)
 
-    def test_vector_search_scaling(self):
-        """Benchmark vector search with different corpus sizes."""
-        corpus_sizes = [100, 1000, 10000]
+        labels, _ = index.knn_query(queries, k=10)
+        benchmark.extra_info["recall"] = recall_at_10(labels, ground_truth)
 
-        for size in corpus_sizes:
-            start = time.perf_counter()
-            self._simulate_vector_search(size)
-            end = time.perf_counter()
+    @pytest.mark.parametrize("ef", [16, 32, 64, 128])
+    def test_vector_search_recall(self, benchmark, vector_indices, ef):
+        """Benchmark search latency against recall@10 across HNSW ef settings."""
+        index, queries, ground_truth = vector_indices[VECTOR_CORPUS_SIZES[-1]]
+        index.set_ef(ef)
+        try:
+            labels, _ = index.knn_query(queries, k=10)
+            recall = recall_at_10(labels, ground_truth)
 
-            print(f"\nVector Search ({size} documents):")
-            print(f"  Time: {(end - start) * 1000:.2f}ms")
+            benchmark.group = "vector-search-recall"
+            benchmark.extra_info["recall"] = recall
+            benchmark(index.knn_query, queries[:1], k=10)
+        finally:
+            index.set_ef(HNSW_EF_SEARCH)
 
-    def _simulate_vector_search(self, corpus_size: int):
-        """Simulate vector search."""
-        time.sleep(0.01 + corpus_size * 0.00001)
+        if ef >= HNSW_EF_SEARCH:
+            assert recall >= 0.9, f"Recall@10 too low at ef={ef}: {recall:.3f}"
 
 
 class TestTranscriptionPerformance:
     """Performance benchmarks for audio transcription."""
 
-    def test_transcription_time(self):
-        """Benchmark transcription time for different audio lengths."""
-        audio_lengths = [
-            ("1 minute", 60),
-            ("5 minutes", 300),
-            ("30 minutes", 1800),
-        ]
+    SAMPLE_RATE = 16000
+    FRAME_LENGTH = 400  # 25 ms window
+    HOP_LENGTH = 160  # 10 ms hop
 
-        for name, seconds in audio_lengths:
-            start = time.perf_counter()
-            self._simulate_transcription(seconds)
-            end = time.perf_counter()
+    @pytest.mark.parametrize(
+        "seconds", [60, 300, 1800], ids=["1 minute", "5 minutes", "30 minutes"]
+    )
+    def test_transcription_time(self, benchmark, seconds):
+        """Benchmark the audio framing and FFT frontend for different audio lengths."""
+        rng = np.random.default_rng(0)
+        audio = rng.standard_normal(seconds * self.SAMPLE_RATE, dtype=np.float32)
+        window = np.hanning(self.FRAME_LENGTH).astype(np.float32)
 
-            real_time_factor = (end - start) / seconds
+        spectrum = benchmark.pedantic(
+            self._spectrogram, args=(audio, window), rounds=3, iterations=1
+        )
+        if benchmark.stats:
+            benchmark.extra_info["rtf"] = benchmark.stats.stats.median / seconds
 
-            print(f"\nTranscription ({name}):")
-            print(f"  Time: {(end - start) * 1000:.2f}ms")
-            print(f"  Real-time factor: {real_time_factor:.4f}x")
+        expected_frames = (len(audio) - self.FRAME_LENGTH) // self.HOP_LENGTH + 1
+        assert spectrum.shape == (expected_frames, self.FRAME_LENGTH // 2 + 1)
 
-    def _simulate_transcription(self, audio_seconds: int):
-        """Simulate audio transcription."""
-        time.sleep(audio_seconds * 0.001)
+    def _spectrogram(self, audio, window):
+        """Frame audio into overlapping windows without copying and FFT each frame."""
+        frames = np.lib.stride_tricks.sliding_window_view(audio, self.FRAME_LENGTH)
+        return np.fft.rfft(frames[:: self.HOP_LENGTH] * window, axis=-1)
 
 
 class TestAPIPerformance:
     """Performance benchmarks for API endpoints."""
 
-    def test_api_response_times(self):
+    @pytest.mark.usefixtures("override_db")
+    @pytest.mark.parametrize(
+        "method,url,budget",
+        [
+            ("GET", "/api/v1/emails", 0.2),
+            ("GET", "/api/v1/calendar/events", 0.2),
+            ("POST", "/api/v1/rag/query", 2.0),
+            ("GET", "/api/v1/settings", 0.2),
+        ],
+    )
+    def test_api_response_times(self, benchmark, client, auth_headers, method, url, budget):
         """Benchmark API response times."""
-        endpoints = [
-            ("GET /emails", 0.05),
-            ("GET /calendar/events", 0.03),
-            ("POST /rag/query", 0.2),
-            ("GET /settings", 0.02),
-        ]
+        payload = {"query": "What is the project deadline?"} if method == "POST" else None
+
+        benchmark.group = "api-response-times"
+        benchmark.extra_info["endpoint"] = f"{method} {url}"
+        response = benchmark(client.request, method, url, headers=auth_headers, json=payload)
 
-        for endpoint, simulated_time in endpoints:
-            times = []
-            for _ in range(10):
-                start = time.perf_counter()
-                time.sleep(simulated_time)
-                end = time.perf_counter()
-                times.append(end - start)
+        assert response.status_code in [200, 401]
+        if benchmark.stats:
+            assert benchmark.stats.stats.median < budget, f"{method} {url} too slow"
 
-            avg_time = statistics.mean(times)
-            print(f"\n{endpoint}:")
-            print(f"  Average: {avg_time * 1000:.2f}ms")
+    @pytest.fixture
+    def serialized_db(self, seeded_db):
+        """Share the seeded session between concurrent requests, one request at a time.
 
-    def test_concurrent_request_handling(self):
-        """Benchmark concurrent request handling."""
-        import threading
+        The SQLite test database is a single connection, so requests overlap everywhere
+        except while they hold the session.
+        """
+        lock = asyncio.Lock()
 
-        concurrent_levels = [1, 5, 10, 20]
+        async def override_get_db():
+            async with lock:
+                yield seeded_db
 
-        for level in concurrent_levels:
-            times = []
-            threads = []
+        app.dependency_overrides[get_db] = override_get_db
+        yield seeded_db
+        app.dependency_overrides.pop(get_db, None)
 
-            def make_request():
-                start = time.perf_counter()
-                time.sleep(0.05)
-                end = time.perf_counter()
-                times.append(end - start)
+    @pytest.mark.usefixtures("serialized_db")
+    @pytest.mark.parametrize("level", [1, 5, 10, 20])
+    def test_concurrent_request_handling(
+        self, benchmark, session_event_loop, aclient, auth_headers, level
+    ):
+        """Benchmark concurrent authenticated requests spread over the list endpoints."""
+        urls = [LIST_ENDPOINTS[i % len(LIST_ENDPOINTS)] for i in range(level)]
 
-            start_all = time.perf_counter()
-            for _ in range(level):
-                t = threading.Thread(target=make_request)
-                threads.append(t)
-                t.start()
+        async def make_requests():
+            return await asyncio.gather(*(aclient.get(url, headers=auth_headers) for url in urls))
 
-            for t in threads:
-                t.join()
-            end_all = time.perf_counter()
+        responses = benchmark.pedantic(
+            lambda: session_event_loop.run_until_complete(make_requests()),
+            rounds=10,
+            iterations=1,
+        )
+        if benchmark.stats:
+            benchmark.extra_info["ops"] = level / benchmark.stats.stats.median
 
-            print(f"\nConcurrent Requests ({level}):")
-            print(f"  Total time: {(end_all - start_all) * 1000:.2f}ms")
-            print(f"  Avg per request: {statistics.mean(times) * 1000:.2f}ms")
+        assert [r.status_code for r in responses] == [200] * level
 
 
 class TestDatabasePerformance:
     """Performance benchmarks for database operations."""
 
-    def test_query_performance(self):
-        """Benchmark database query performance."""
-        query_types = [
-            ("Simple SELECT", 0.005),
-            ("JOIN query", 0.02),
-            ("Aggregation", 0.03),
-            ("Full-text search", 0.05),
-        ]
-
-        for query_type, simulated_time in query_types:
-            times = []
-            for _ in range(20):
-                start = time.perf_counter()
-                time.sleep(simulated_time)
-                end = time.perf_counter()
-                times.append(end - start)
-
-            avg_time = statistics.mean(times)
-            print(f"\n{query_type}:")
-            print(f"  Average: {avg_time * 1000:.2f}ms")
-
-    def test_bulk_insert_performance(self):
-        """Benchmark bulk insert performance."""
-        record_counts = [100, 1000, 10000]
-
-        for count in record_counts:
-            start = time.perf_counter()
-            self._simulate_bulk_insert(count)
-            end = time.perf_counter()
-
-            records_per_second = count / (end - start)
-
-            print(f"\nBulk Insert ({count} records):")
-            print(f"  Time: {(end - start) * 1000:.2f}ms")
-            print(f"  Records/sec: {records_per_second:.0f}")
-
-    def _simulate_bulk_insert(self, count: int):
-        """Simulate bulk insert."""
-        time.sleep(count * 0.0001)
-
-
-def generate_performance_report():
-    """Generate a performance report."""
-    report = """
-# OpenFyxer Performance Report
-
-## Test Environment
-- Date: {date}
-- Platform: Linux
-- Python: 3.11
-
-## Benchmarks
-
-### Email Processing
-| Operation | Target | Actual | Status |
-|-----------|--------|--------|--------|
-| Classification | <500ms | ~50ms | PASS |
-| Draft Generation | <5s | ~200ms | PASS |
-| Batch (100 emails) | <10s | ~1s | PASS |
-
-### RAG Operations
-| Operation | Target | Actual | Status |
-|-----------|--------|--------|--------|
-| Query Response | <2s | ~100ms | PASS |
-| Document Indexing | <5s | ~500ms | PASS |
-| Vector Search (10k docs) | <1s | ~110ms | PASS |
-
-### Transcription
-| Audio Length | Target | Actual | Status |
-|--------------|--------|--------|--------|
-| 1 minute | <30s | ~60ms | PASS |
-| 5 minutes | <2min | ~300ms | PASS |
-| 30 minutes | <10min | ~1.8s | PASS |
-
-### API Response Times
-| Endpoint | Target | Actual | Status |
-|----------|--------|--------|--------|
-| GET /emails | <200ms | ~50ms | PASS |
-| GET /calendar | <200ms | ~30ms | PASS |
-| POST /rag/query | <2s | ~200ms | PASS |
-
-## Conclusions
-All performance targets have been met. The system is ready for production use.
-""".format(date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-
-    return report
-
-
-if __name__ == "__main__":
-    print(generate_performance_report())
+    @pytest.mark.parametrize(
+        "kind", ["simple-select", "join", "aggregation", "text-search"]
+    )
+    def test_query_performance(self, benchmark, session_event_loop, seeded_db, test_user, kind):
+        """Benchmark representative read queries against seeded data."""
+        user_id = uuid.UUID(test_user["id"])
+        statement = {
+            "simple-select": select(Email).where(Email.message_id == "<seed-42@example.com>"),
+            "join": (
+                select(Email.subject, EmailAccount.email_address)
+                .join(EmailAccount, Email.account_id == EmailAccount.id)
+                .where(EmailAccount.user_id == user_id)
+                .order_by(Email.received_at.desc())
+                .limit(50)
+            ),
+            "aggregation": select(Email.category, func.count()).group_by(Email.category),
+            "text-search": select(Email).where(Email.body_text.ilike("%week 7%")).limit(20),
+        }[kind]
+
+        async def run_query():
+            result = await seeded_db.execute(statement)
+            return result.all()
+
+        benchmark.group = "database-queries"
+        rows = benchmark(lambda: session_event_loop.run_until_complete(run_query()))
+
+        assert rows
+
+    @pytest.mark.parametrize("path", ["core", "orm"])
+    @pytest.mark.parametrize("count", [100, 1000, 10000])
+    def test_bulk_insert_performance(
+        self, benchmark, session_event_loop, db_session, email_rows, count, path
+    ):
+        """Benchmark bulk email inserts through the Core and ORM paths."""
+        columns = {name: values[:count].tolist() for name, values in email_rows.items()}
+        columns["account_id"] = [uuid.uuid4()] * count
+        keys = list(columns)
+
+        def make_rows():
+            # Row dicts are built outside the timed region
+            return ([dict(zip(keys, row)) for row in zip(*columns.values())],), {}
+
+        async def insert_core(rows):
+            await db_session.execute(insert(Email), rows)
+            await db_session.commit()
+
+        async def insert_orm(rows):
+            db_session.add_all([Email(**row) for row in rows])
+            await db_session.commit()
+
+        bulk_insert = insert_core if path == "core" else insert_orm
+
+        benchmark.group = f"bulk-insert-{count}"
+        benchmark.pedantic(
+            lambda rows: session_event_loop.run_until_complete(bulk_insert(rows)),
+            setup=make_rows,
+            rounds=3,
+            warmup_rounds=1,
+        )
+        if benchmark.stats:
+            benchmark.extra_info["records_per_second"] = count / benchmark.stats.stats.median
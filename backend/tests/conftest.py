@@ -1,20 +1,28 @@
 import asyncio
+import itertools
 import os
 import uuid
 from datetime import datetime, timedelta
-from typing import AsyncGenerator, Generator
+from types import SimpleNamespace
+from typing import Any, AsyncGenerator, Dict, Generator, Tuple
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+import pytest_asyncio
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 # Ensure the FastAPI app and SQLAlchemy engine use the in-memory SQLite database during tests.
 os.environ["DATABASE_URL"] = TEST_DATABASE_URL
 
+import httpx
+import numpy as np
 from fastapi.testclient import TestClient
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.db.base import Base
@@ -27,60 +35,126 @@ from app.models.email_account import EmailAccount
 from app.models.meeting import Meeting
 from app.models.user import User
 
+# Test ids only need to be unique, not random; offset the counter per pytest-xdist worker
+_uuid_counter = itertools.count((int(os.environ.get("PYTEST_XDIST_WORKER", "gw0")[2:]) << 48) + 1)
+
+
+def _uuid() -> uuid.UUID:
+    return uuid.UUID(int=next(_uuid_counter))
+
+
+# Hashing is deliberately slow, and the token only depends on the user id; compute both once
+TEST_USER_ID = str(_uuid())
+TEST_PASSWORD_HASH = get_password_hash("testpassword123")
+
+
+def pytest_collection_modifyitems(items) -> None:
+    # Async fixtures default to the session loop; run async tests there too so they can
+    # share the engine and db_session connection without crossing event loops
+    session_loop = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if pytest_asyncio.is_async_test(item):
+            item.add_marker(session_loop, append=False)
+
 
 @pytest.fixture(scope="session")
-def event_loop() -> Generator:
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
+async def session_event_loop() -> asyncio.AbstractEventLoop:
+    """Session loop, for sync tests (e.g. benchmarks) that drive async fixtures."""
+    return asyncio.get_running_loop()
 
 
-@pytest.fixture(scope="function")
+@compiles(UUID, "sqlite")
+def _compile_uuid_sqlite(type_, compiler, **kw) -> str:
+    # The models use PostgreSQL UUID columns; store them as text on the SQLite test database
+    return "CHAR(36)"
+
+
+@pytest.fixture(scope="session")
 async def async_engine():
-    engine = create_async_engine(TEST_DATABASE_URL, echo=False)
+    # In-memory SQLite lives per connection, so every checkout must share one
+    engine = create_async_engine(
+        TEST_DATABASE_URL,
+        echo=False,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+
+    # pysqlite defers BEGIN on its own, which breaks SAVEPOINT; let SQLAlchemy emit it
+    @event.listens_for(engine.sync_engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield engine
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
     await engine.dispose()
 
 
-@pytest.fixture(scope="function")
-async def db_session(async_engine) -> AsyncGenerator[AsyncSession, None]:
-    async_session = sessionmaker(
-        async_engine, class_=AsyncSession, expire_on_commit=False
+@pytest.fixture(scope="session")
+def session_factory(async_engine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind=async_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
     )
-    async with async_session() as session:
-        yield session
 
 
 @pytest.fixture(scope="function")
-def client(db_session) -> Generator:
+async def db_session(async_engine, session_factory) -> AsyncGenerator[AsyncSession, None]:
+    # Isolate tests with a rolled-back outer transaction; commits release a SAVEPOINT
+    async with async_engine.connect() as connection:
+        transaction = await connection.begin()
+        async with session_factory(bind=connection) as session:
+            yield session
+        await transaction.rollback()
+
+
+@pytest.fixture(scope="session")
+def client() -> Generator:
+    # Entering TestClient runs the app lifespan, so do it once per session
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+async def aclient() -> AsyncGenerator[httpx.AsyncClient, None]:
+    # Calls the ASGI app on the test's own loop, without TestClient's portal thread
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture(scope="function")
+def override_db(db_session) -> Generator:
     async def override_get_db():
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as c:
-        yield c
-    app.dependency_overrides.clear()
+    yield db_session
+    app.dependency_overrides.pop(get_db, None)
 
 
 @pytest.fixture
 def test_user() -> dict:
     return {
-        "id": str(uuid.uuid4()),
+        "id": TEST_USER_ID,
         "email": "test@example.com",
         "full_name": "Test User",
-        "hashed_password": get_password_hash("testpassword123"),
+        "hashed_password": TEST_PASSWORD_HASH,
         "is_active": True,
         "two_factor_enabled": False,
     }
 
 
-@pytest.fixture
-def test_user_token(test_user) -> str:
-    return create_access_token(subject=test_user["id"])
+@pytest.fixture(scope="session")
+def test_user_token() -> str:
+    # Outlive the default access-token expiry for long test sessions
+    return create_access_token(subject=TEST_USER_ID, expires_delta=timedelta(hours=12))
 
 
 @pytest.fixture
@@ -91,7 +165,7 @@ def auth_headers(test_user_token) -> dict:
 @pytest.fixture
 def sample_email() -> dict:
     return {
-        "id": str(uuid.uuid4()),
+        "id": str(_uuid()),
         "message_id": "<test123@example.com>",
         "thread_id": "thread123",
         "subject": "Urgent: Project deadline tomorrow",
@@ -110,7 +184,7 @@ def sample_email() -> dict:
 @pytest.fixture
 def sample_calendar_event() -> dict:
     return {
-        "id": str(uuid.uuid4()),
+        "id": str(_uuid()),
         "title": "Team Meeting",
         "description": "Weekly team sync",
         "start_time": datetime.utcnow() + timedelta(hours=1),
@@ -126,7 +200,7 @@ def sample_calendar_event() -> dict:
 @pytest.fixture
 def sample_meeting() -> dict:
     return {
-        "id": str(uuid.uuid4()),
+        "id": str(_uuid()),
         "title": "Project Review",
         "description": "Review Q4 project progress",
         "meeting_date": datetime.utcnow(),
@@ -135,70 +209,140 @@ def sample_meeting() -> dict:
     }
 
 
-@pytest.fixture
-def mock_llm_service():
-    mock = MagicMock()
-    mock.generate = AsyncMock(return_value="This is a generated response.")
-    mock.classify_email = AsyncMock(return_value="urgent")
-    mock.generate_draft = AsyncMock(
-        return_value="Thank you for your email. I will complete the project by tomorrow."
-    )
-    mock.summarize = AsyncMock(
-        return_value="Meeting summary: Discussed project progress and next steps."
+@pytest.fixture(scope="session")
+def email_rows() -> Dict[str, Any]:
+    """Column-oriented synthetic email rows for bulk-insert benchmarks."""
+    count = 10000
+    return {
+        "message_id": np.array([f"<bench-{i}@example.com>" for i in range(count)]),
+        "subject": np.array([f"Benchmark email {i}" for i in range(count)]),
+        "sender": np.full(count, "sender@example.com"),
+        "received_at": np.full(count, np.datetime64("2024-01-01T00:00:00", "us")),
+    }
+
+
+# Session-wide service mocks with the children (and their return values) each was built with.
+# Tests freely replace or add children and set return values or side effects, so every mock is
+# put back exactly as built after each test.
+_SERVICE_MOCKS: Dict[str, Tuple[MagicMock, Dict[str, Tuple[AsyncMock, Any]]]] = {}
+
+
+def _service_mock(name: str, **children: Any) -> MagicMock:
+    mock = MagicMock(**children)
+    _SERVICE_MOCKS[name] = (
+        mock,
+        {key: (child, child.return_value) for key, child in children.items()},
     )
     return mock
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def _reset_service_mocks(request) -> Generator:
+    used = [
+        (request.getfixturevalue(name), mock, children)
+        for name, (mock, children) in _SERVICE_MOCKS.items()
+        if name in request.fixturenames
+    ]
+    yield
+    for value, mock, children in used:
+        if value is not mock:
+            continue
+        mock.reset_mock(return_value=True, side_effect=True)
+        for name in set(mock._mock_children) - set(children):
+            # delattr leaves a "deleted" marker behind; drop it so the name auto-creates again
+            delattr(mock, name)
+            del mock._mock_children[name]
+        mock.configure_mock(**{key: child for key, (child, _) in children.items()})
+        for child, return_value in children.values():
+            child.reset_mock(return_value=True, side_effect=True)
+            child.return_value = return_value
+
+
+@pytest.fixture(scope="session")
+def mock_llm_service():
+    return _service_mock(
+        "mock_llm_service",
+        generate=AsyncMock(return_value="This is a generated response."),
+        classify_email=AsyncMock(return_value="urgent"),
+        generate_draft=AsyncMock(
+            return_value="Thank you for your email. I will complete the project by tomorrow."
+        ),
+        summarize=AsyncMock(
+            return_value="Meeting summary: Discussed project progress and next steps."
+        ),
+    )
+
+
+@pytest.fixture(scope="session")
 def mock_rag_service():
-    mock = MagicMock()
-    mock.query = AsyncMock(
-        return_value={
-            "answer": "Based on the documents, the project deadline is tomorrow.",
-            "sources": [
-                {
-                    "type": "email",
-                    "id": "123",
-                    "title": "Project Update",
-                    "snippet": "Deadline is tomorrow",
-                    "relevance_score": 0.95,
-                }
-            ],
-            "confidence": 0.9,
-        }
+    return _service_mock(
+        "mock_rag_service",
+        query=AsyncMock(
+            return_value={
+                "answer": "Based on the documents, the project deadline is tomorrow.",
+                "sources": [
+                    {
+                        "type": "email",
+                        "id": "123",
+                        "title": "Project Update",
+                        "snippet": "Deadline is tomorrow",
+                        "relevance_score": 0.95,
+                    }
+                ],
+                "confidence": 0.9,
+            }
+        ),
+        index_email=AsyncMock(return_value=True),
+        index_document=AsyncMock(return_value=True),
     )
-    mock.index_email = AsyncMock(return_value=True)
-    mock.index_document = AsyncMock(return_value=True)
-    return mock
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_email_service():
-    mock = MagicMock()
-    mock.fetch_emails = AsyncMock(return_value=[])
-    mock.send_email = AsyncMock(return_value=True)
-    return mock
+    return _service_mock(
+        "mock_email_service",
+        fetch_emails=AsyncMock(return_value=[]),
+        send_email=AsyncMock(return_value=True),
+    )
 
 
-@pytest.fixture
-def mock_calendar_service():
-    mock = MagicMock()
-    mock.get_events = AsyncMock(return_value=[])
-    mock.create_event = AsyncMock(return_value={"id": "event123"})
-    return mock
+def _async_return(value: Any):
+    """Async stub returning ``value``; exposes ``return_value`` and ``call_count`` like AsyncMock."""
+
+    async def stub(*args: Any, **kwargs: Any) -> Any:
+        stub.call_count += 1
+        return stub.return_value
+
+    stub.return_value = value
+    stub.call_count = 0
+    return stub
 
 
 @pytest.fixture
+def mock_calendar_service() -> SimpleNamespace:
+    """Plain async stubs; cheap enough to rebuild per test, so nothing needs resetting."""
+    return SimpleNamespace(
+        get_events=_async_return([]),
+        create_event=_async_return({"id": "event123"}),
+        update_event=_async_return({"id": "event123"}),
+        delete_event=_async_return(True),
+        check_conflicts=_async_return([]),
+        find_available_slots=_async_return([]),
+    )
+
+
+@pytest.fixture(scope="session")
 def mock_transcription_service():
-    mock = MagicMock()
-    mock.transcribe = AsyncMock(
-        return_value={
-            "text": "This is the transcribed text from the meeting.",
-            "segments": [
-                {"start": 0.0, "end": 5.0, "text": "This is the transcribed text"},
-                {"start": 5.0, "end": 10.0, "text": "from the meeting."},
-            ],
-            "language": "en",
-        }
+    return _service_mock(
+        "mock_transcription_service",
+        transcribe=AsyncMock(
+            return_value={
+                "text": "This is the transcribed text from the meeting.",
+                "segments": [
+                    {"start": 0.0, "end": 5.0, "text": "This is the transcribed text"},
+                    {"start": 5.0, "end": 10.0, "text": "from the meeting."},
+                ],
+                "language": "en",
+            }
+        ),
     )
-    return mock
@@ -5,16 +5,16 @@ Tests the REST API endpoints for all major features.
 
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from fastapi.testclient import TestClient
 from datetime import datetime
 
 
 class TestAuthEndpoints:
     """Tests for authentication endpoints."""
 
-    def test_register_user(self, client):
+    @pytest.mark.usefixtures("override_db")
+    async def test_register_user(self, aclient):
         """Test user registration endpoint."""
-        response = client.post(
+        response = await aclient.post(
             "/api/v1/auth/register",
             json={
                 "email": "newuser@example.com",
@@ -25,9 +25,10 @@ class TestAuthEndpoints:
 
         assert response.status_code in [200, 201, 422]
 
-    def test_login_user(self, client):
+    @pytest.mark.usefixtures("override_db")
+    async def test_login_user(self, aclient):
         """Test user login endpoint."""
-        response = client.post(
+        response = await aclient.post(
             "/api/v1/auth/login",
             data={
                 "username": "test@example.com",
@@ -37,9 +38,10 @@ class TestAuthEndpoints:
 
         assert response.status_code in [200, 401, 422]
 
-    def test_login_invalid_credentials(self, client):
+    @pytest.mark.usefixtures("override_db")
+    async def test_login_invalid_credentials(self, aclient):
         """Test login with invalid credentials."""
-        response = client.post(
+        response = await aclient.post(
             "/api/v1/auth/login",
             data={
                 "username": "nonexistent@example.com",
@@ -49,58 +51,74 @@ class TestAuthEndpoints:
 
         assert response.status_code in [401, 422]
 
-    def test_protected_endpoint_without_token(self, client):
+    async def test_protected_endpoint_without_token(self, aclient):
         """Test accessing protected endpoint without token."""
-        response = client.get("/api/v1/users/me")
+        response = await aclient.get("/api/v1/users/me")
 
         assert response.status_code == 401
 
-    def test_protected_endpoint_with_token(self, client, auth_headers):
+    @pytest.mark.usefixtures("override_db")
+    async def test_protected_endpoint_with_token(self, aclient, auth_headers):
         """Test accessing protected endpoint with valid token."""
-        response = client.get("/api/v1/users/me", headers=auth_headers)
+        response = await aclient.get("/api/v1/users/me", headers=auth_headers)
 
         assert response.status_code in [200, 401]
 
 
-class TestEmailEndpoints:
-    """Tests for email endpoints."""
+@pytest.mark.usefixtures("override_db")
+class TestListEndpoints:
+    """Smoke tests for authenticated read-only endpoints."""
 
-    def test_get_emails(self, client, auth_headers):
-        """Test getting emails list."""
-        response = client.get("/api/v1/emails", headers=auth_headers)
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/api/v1/emails",
+            "/api/v1/emails?category=urgent",
+            "/api/v1/drafts",
+            "/api/v1/calendar/events",
+            "/api/v1/rag/documents",
+            "/api/v1/rag/status",
+            "/api/v1/meetings",
+            "/api/v1/settings",
+            "/api/v1/settings/llm-providers",
+            "/api/v1/chat/history",
+            "/api/v1/audit/logs",
+            "/api/v1/audit/logs?action=login&status=success",
+            "/api/v1/audit/stats",
+        ],
+    )
+    async def test_get_endpoints_smoke(self, aclient, auth_headers, path):
+        """Test that read-only endpoints respond for an authenticated user."""
+        response = await aclient.get(path, headers=auth_headers)
 
         assert response.status_code in [200, 401]
 
-    def test_get_emails_with_category_filter(self, client, auth_headers):
-        """Test getting emails filtered by category."""
-        response = client.get(
-            "/api/v1/emails?category=urgent",
-            headers=auth_headers,
-        )
 
-        assert response.status_code in [200, 401]
+@pytest.mark.usefixtures("override_db")
+class TestEmailEndpoints:
+    """Tests for email endpoints."""
 
-    def test_get_single_email(self, client, auth_headers):
+    async def test_get_single_email(self, aclient, auth_headers):
         """Test getting a single email."""
-        response = client.get(
+        response = await aclient.get(
             "/api/v1/emails/email123",
             headers=auth_headers,
         )
 
         assert response.status_code in [200, 404, 401]
 
-    def test_mark_email_as_read(self, client, auth_headers):
+    async def test_mark_email_as_read(self, aclient, auth_headers):
         """Test marking email as read."""
-        response = client.put(
+        response = await aclient.put(
             "/api/v1/emails/email123/read",
             headers=auth_headers,
         )
 
         assert response.status_code in [200, 404, 401]
 
-    def test_archive_email(self, client, auth_headers):
+    async def test_archive_email(self, aclient, auth_headers):
         """Test archiving an email."""
-        response = client.put(
+        response = await aclient.put(
             "/api/v1/emails/email123/archive",
             headers=auth_headers,
         )
@@ -108,12 +126,13 @@ class TestEmailEndpoints:
         assert response.status_code in [200, 404, 401]
 
 
+@pytest.mark.usefixtures("override_db")
 class TestDraftEndpoints:
     """Tests for draft endpoints."""
 
-    def test_generate_draft(self, client, auth_headers):
+    async def test_generate_draft(self, aclient, auth_headers):
         """Test generating a draft reply."""
-        response = client.post(
+        response = await aclient.post(
             "/api/v1/drafts",
             headers=auth_headers,
             json={
@@ -124,15 +143,9 @@ class TestDraftEndpoints:
 
         assert response.status_code in [200, 201, 404, 401]
 
-    def test_get_drafts(self, client, auth_headers):
-        """Test getting all drafts."""
-        response = client.get("/api/v1/drafts", headers=auth_headers)
-
-        assert response.status_code in [200, 401]
-
-    def test_update_draft(self, client, auth_headers):
+    async def test_update_draft(self, aclient, auth_headers):
         """Test updating a draft."""
-        response = client.put(
+        response = await aclient.put(
             "/api/v1/drafts/draft123",
             headers=auth_headers,
             json={
@@ -142,18 +155,18 @@ class TestDraftEndpoints:
 
         assert response.status_code in [200, 404, 401]
 
-    def test_approve_draft(self, client, auth_headers):
+    async def test_approve_draft(self, aclient, auth_headers):
         """Test approving a draft."""
-        response = client.post(
+        response = await aclient.post(
             "/api/v1/drafts/draft123/approve",
             headers=auth_headers,
         )
 
         assert response.status_code in [200, 404, 401]
 
-    def test_send_draft(self, client, auth_headers):
+    async def test_send_draft(self, aclient, auth_headers):
         """Test sending an approved draft."""
-        response = client.post(
+        response = await aclient.post(
             "/api/v1/drafts/draft123/send",
             headers=auth_headers,
         )
@@ -161,18 +174,13 @@ class TestDraftEndpoints:
         assert response.status_code in [200, 404, 401]
 
 
+@pytest.mark.usefixtures("override_db")
 class TestCalendarEndpoints:
     """Tests for calendar endpoints."""
 
-    def test_get_events(self, client, auth_headers):
-        """Test getting calendar events."""
-        response = client.get("/api/v1/calendar/events", headers=auth_headers)
-
-        assert response.status_code in [200, 401]
-
-    def test_create_event(self, client, auth_headers):
+    async def test_create_event(self, aclient, auth_headers):
         """Test creating a calendar event."""
-        response = client.post(
+        response = await aclient.post(
             "/api/v1/calendar/events",
             headers=auth_headers,
             json={
@@ -185,9 +193,9 @@ class TestCalendarEndpoints:
 
         assert response.status_code in [200, 201, 401]
 
-    def test_update_event(self, client, auth_headers):
+    async def test_update_event(self, aclient, auth_headers):
         """Test updating a calendar event."""
-        response = client.put(
+        response = await aclient.put(
             "/api/v1/calendar/events/event123",
             headers=auth_headers,
             json={
@@ -197,18 +205,18 @@ class TestCalendarEndpoints:
 
         assert response.status_code in [200, 404, 401]
 
-    def test_delete_event(self, client, auth_headers):
+    async def test_delete_event(self, aclient, auth_headers):
         """Test deleting a calendar event."""
-        response = client.delete(
+        response = await aclient.delete(
             "/api/v1/calendar/events/event123",
             headers=auth_headers,
         )
 
         assert response.status_code in [200, 204, 404, 401]
 
-    def test_check_conflicts(self, client, auth_headers):
+    async def test_check_conflicts(self, aclient, auth_headers):
         """Test checking for event conflicts."""
-        response = client.post(
+        response = await aclient.post(
             "/api/v1/calendar/events/event123/check-conflicts",
             headers=auth_headers,
             json={
@@ -220,12 +228,13 @@ class TestCalendarEndpoints:
         assert response.status_code in [200, 401]
 
 
+@pytest.mark.usefixtures("override_db")
 class TestRAGEndpoints:
     """Tests for RAG endpoints."""
 
-    def test_rag_query(self, client, auth_headers):
+    async def test_rag_query(self, aclient, auth_headers):
         """Test RAG query endpoint."""
-        response = client.post(
+        response = await aclient.post(
             "/api/v1/rag/query",
             headers=auth_headers,
             json={
@@ -235,15 +244,9 @@ class TestRAGEndpoints:
 
         assert response.status_code in [200, 401]
 
-    def test_get_documents(self, client, auth_headers):
-        """Test getting indexed documents."""
-        response = client.get("/api/v1/rag/documents", headers=auth_headers)
-
-        assert response.status_code in [200, 401]
-
-    def test_upload_document(self, client, auth_headers):
+    async def test_upload_document(self, aclient, auth_headers):
         """Test uploading a document for indexing."""
-        response = client.post(
+        response = await aclient.post(
             "/api/v1/rag/documents",
             headers=auth_headers,
             files={"file": ("test.txt", b"Test content", "text/plain")},
@@ -251,34 +254,23 @@ class TestRAGEndpoints:
 
         assert response.status_code in [200, 201, 401]
 
-    def test_delete_document(self, client, auth_headers):
+    async def test_delete_document(self, aclient, auth_headers):
         """Test deleting a document."""
-        response = client.delete(
+        response = await aclient.delete(
             "/api/v1/rag/documents/doc123",
             headers=auth_headers,
         )
 
         assert response.status_code in [200, 204, 404, 401]
 
-    def test_get_indexing_status(self, client, auth_headers):
-        """Test getting indexing status."""
-        response = client.get("/api/v1/rag/status", headers=auth_headers)
-
-        assert response.status_code in [200, 401]
-
 
+@pytest.mark.usefixtures("override_db")
 class TestMeetingEndpoints:
     """Tests for meeting endpoints."""
 
-    def test_get_meetings(self, client, auth_headers):
-        """Test getting meetings list."""
-        response = client.get("/api/v1/meetings", headers=auth_headers)
-
-        assert response.status_code in [200, 401]
-
-    def test_create_meeting(self, client, auth_headers):
+    async def test_create_meeting(self, aclient, auth_headers):
         """Test creating a meeting."""
-        response = client.post(
+        response = await aclient.post(
             "/api/v1/meetings",
             headers=auth_headers,
             json={
@@ -290,9 +282,9 @@ class TestMeetingEndpoints:
 
         assert response.status_code in [200, 201, 401]
 
-    def test_upload_audio(self, client, auth_headers):
+    async def test_upload_audio(self, aclient, auth_headers):
         """Test uploading meeting audio."""
-        response = client.post(
+        response = await aclient.post(
             "/api/v1/meetings/meeting123/audio",
             headers=auth_headers,
             files={"file": ("audio.mp3", b"fake audio content", "audio/mpeg")},
@@ -300,18 +292,18 @@ class TestMeetingEndpoints:
 
         assert response.status_code in [200, 201, 404, 401]
 
-    def test_transcribe_meeting(self, client, auth_headers):
+    async def test_transcribe_meeting(self, aclient, auth_headers):
         """Test transcribing meeting audio."""
-        response = client.post(
+        response = await aclient.post(
             "/api/v1/meetings/meeting123/transcribe",
             headers=auth_headers,
         )
 
         assert response.status_code in [200, 202, 404, 401]
 
-    def test_summarize_meeting(self, client, auth_headers):
+    async def test_summarize_meeting(self, aclient, auth_headers):
         """Test summarizing meeting."""
-        response = client.post(
+        response = await aclient.post(
             "/api/v1/meetings/meeting123/summarize",
             headers=auth_headers,
         )
@@ -319,18 +311,13 @@ class TestMeetingEndpoints:
         assert response.status_code in [200, 202, 404, 401]
 
 
+@pytest.mark.usefixtures("override_db")
 class TestSettingsEndpoints:
     """Tests for settings endpoints."""
 
-    def test_get_settings(self, client, auth_headers):
-        """Test getting user settings."""
-        response = client.get("/api/v1/settings", headers=auth_headers)
-
-        assert response.status_code in [200, 401]
-
-    def test_update_settings(self, client, auth_headers):
+    async def test_update_settings(self, aclient, auth_headers):
         """Test updating user settings."""
-        response = client.put(
+        response = await aclient.put(
             "/api/v1/settings",
             headers=auth_headers,
             json={
@@ -341,19 +328,14 @@ class TestSettingsEndpoints:
 
         assert response.status_code in [200, 401]
 
-    def test_get_llm_providers(self, client, auth_headers):
-        """Test getting LLM providers."""
-        response = client.get("/api/v1/settings/llm-providers", headers=auth_headers)
-
-        assert response.status_code in [200, 401]
-
 
+@pytest.mark.usefixtures("override_db")
 class TestChatEndpoints:
     """Tests for chat endpoints."""
 
-    def test_send_chat_message(self, client, auth_headers):
+    async def test_send_chat_message(self, aclient, auth_headers):
         """Test sending a chat message."""
-        response = client.post(
+        response = await aclient.post(
             "/api/v1/chat",
             headers=auth_headers,
             json={
@@ -363,39 +345,8 @@ class TestChatEndpoints:
 
         assert response.status_code in [200, 401]
 
-    def test_get_chat_history(self, client, auth_headers):
-        """Test getting chat history."""
-        response = client.get("/api/v1/chat/history", headers=auth_headers)
-
-        assert response.status_code in [200, 401]
-
-    def test_clear_chat_history(self, client, auth_headers):
+    async def test_clear_chat_history(self, aclient, auth_headers):
         """Test clearing chat history."""
-        response = client.delete("/api/v1/chat/history", headers=auth_headers)
+        response = await aclient.delete("/api/v1/chat/history", headers=auth_headers)
 
         assert response.status_code in [200, 204, 401]
-
-
-class TestAuditEndpoints:
-    """Tests for audit endpoints."""
-
-    def test_get_audit_logs(self, client, auth_headers):
-        """Test getting audit logs."""
-        response = client.get("/api/v1/audit/logs", headers=auth_headers)
-
-        assert response.status_code in [200, 401]
-
-    def test_get_audit_stats(self, client, auth_headers):
-        """Test getting audit statistics."""
-        response = client.get("/api/v1/audit/stats", headers=auth_headers)
-
-        assert response.status_code in [200, 401]
-
-    def test_filter_audit_logs(self, client, auth_headers):
-        """Test filtering audit logs."""
-        response = client.get(
-            "/api/v1/audit/logs?action=login&status=success",
-            headers=auth_headers,
-        )
-
-        assert response.status_code in [200, 401]
@@ -3,139 +3,136 @@ Integration tests for calendar flow.
 Tests calendar sync, event creation, and conflict detection.
 """
 
+from __future__ import annotations
+
+import bisect
 import pytest
-from unittest.mock import AsyncMock, MagicMock
 from datetime import datetime, timedelta
 
 
-class TestCalendarFlow:
-    """Integration tests for calendar functionality."""
-
-    @pytest.fixture
-    def mock_calendar_service(self):
-        """Create mock calendar service."""
-        mock = MagicMock()
-        mock.get_events = AsyncMock(return_value=[])
-        mock.create_event = AsyncMock(return_value={"id": "event123"})
-        mock.update_event = AsyncMock(return_value={"id": "event123"})
-        mock.delete_event = AsyncMock(return_value=True)
-        mock.check_conflicts = AsyncMock(return_value=[])
-        mock.find_available_slots = AsyncMock(return_value=[])
-        return mock
-
-    @pytest.mark.asyncio
-    async def test_calendar_sync_flow(self, mock_calendar_service):
-        """Test calendar sync flow."""
-        mock_calendar_service.get_events = AsyncMock(
-            return_value=[
-                {
-                    "id": "event1",
-                    "title": "Team Meeting",
-                    "start_time": datetime.utcnow() + timedelta(hours=1),
-                    "end_time": datetime.utcnow() + timedelta(hours=2),
-                },
-                {
-                    "id": "event2",
-                    "title": "Client Call",
-                    "start_time": datetime.utcnow() + timedelta(hours=3),
-                    "end_time": datetime.utcnow() + timedelta(hours=4),
-                },
-            ]
-        )
-
-        events = await mock_calendar_service.get_events()
-
-        assert len(events) == 2
-        assert events[0]["title"] == "Team Meeting"
+_BASE = datetime(2024, 1, 15, 9, 0)
 
-    @pytest.mark.asyncio
-    async def test_event_creation_flow(self, mock_calendar_service):
-        """Test event creation flow."""
-        new_event = {
+MOCK_FLOW_CASES = [
+    pytest.param(
+        "get_events",
+        [
+            {
+                "id": "event1",
+                "title": "Team Meeting",
+                "start_time": _BASE + timedelta(hours=1),
+                "end_time": _BASE + timedelta(hours=2),
+            },
+            {
+                "id": "event2",
+                "title": "Client Call",
+                "start_time": _BASE + timedelta(hours=3),
+                "end_time": _BASE + timedelta(hours=4),
+            },
+        ],
+        {},
+        lambda r: len(r) == 2 and r[0]["title"] == "Team Meeting",
+        id="sync",
+    ),
+    pytest.param(
+        "create_event",
+        None,
+        {
             "title": "Project Review",
-            "start_time": datetime.utcnow() + timedelta(days=1),
-            "end_time": datetime.utcnow() + timedelta(days=1, hours=1),
+            "start_time": _BASE + timedelta(days=1),
+            "end_time": _BASE + timedelta(days=1, hours=1),
             "description": "Review Q4 progress",
             "attendees": ["alice@company.com", "bob@company.com"],
-        }
-
-        result = await mock_calendar_service.create_event(new_event)
-
-        assert result["id"] == "event123"
-        mock_calendar_service.create_event.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_conflict_detection_flow(self, mock_calendar_service):
-        """Test conflict detection when creating events."""
-        existing_event = {
-            "id": "event1",
-            "title": "Existing Meeting",
-            "start_time": datetime.utcnow() + timedelta(hours=1),
-            "end_time": datetime.utcnow() + timedelta(hours=2),
-        }
-
-        mock_calendar_service.check_conflicts = AsyncMock(return_value=[existing_event])
+        },
+        lambda r: r["id"] == "event123",
+        id="create",
+    ),
+    pytest.param(
+        "check_conflicts",
+        [
+            {
+                "id": "event1",
+                "title": "Existing Meeting",
+                "start_time": _BASE + timedelta(hours=1),
+                "end_time": _BASE + timedelta(hours=2),
+            }
+        ],
+        {
+            "start_time": _BASE + timedelta(hours=1, minutes=30),
+            "end_time": _BASE + timedelta(hours=2, minutes=30),
+        },
+        lambda r: len(r) == 1 and r[0]["title"] == "Existing Meeting",
+        id="conflicts",
+    ),
+    pytest.param(
+        "find_available_slots",
+        [
+            {
+                "start_time": _BASE + timedelta(hours=5),
+                "end_time": _BASE + timedelta(hours=6),
+                "duration_minutes": 60,
+            },
+            {
+                "start_time": _BASE + timedelta(hours=7),
+                "end_time": _BASE + timedelta(hours=8),
+                "duration_minutes": 60,
+            },
+        ],
+        {"duration_minutes": 60, "date_from": _BASE, "date_to": _BASE + timedelta(days=1)},
+        lambda r: len(r) == 2 and all(slot["duration_minutes"] == 60 for slot in r),
+        id="slots",
+    ),
+    pytest.param(
+        "create_event",
+        {
+            "id": "recurring1",
+            "title": "Weekly Standup",
+            "start_time": _BASE,
+            "end_time": _BASE + timedelta(minutes=30),
+            "is_recurring": True,
+            "recurrence_rule": "FREQ=WEEKLY;BYDAY=MO,WE,FR",
+        },
+        {},
+        lambda r: r["is_recurring"] is True and "WEEKLY" in r["recurrence_rule"],
+        id="recurring",
+    ),
+]
 
-        new_event_time = datetime.utcnow() + timedelta(hours=1, minutes=30)
-        conflicts = await mock_calendar_service.check_conflicts(
-            start_time=new_event_time,
-            end_time=new_event_time + timedelta(hours=1),
-        )
 
-        assert len(conflicts) == 1
-        assert conflicts[0]["title"] == "Existing Meeting"
+class TestCalendarFlow:
+    """Integration tests for calendar functionality."""
 
-    @pytest.mark.asyncio
-    async def test_available_slots_flow(self, mock_calendar_service):
-        """Test finding available time slots."""
-        mock_calendar_service.find_available_slots = AsyncMock(
-            return_value=[
-                {
-                    "start_time": datetime.utcnow() + timedelta(hours=5),
-                    "end_time": datetime.utcnow() + timedelta(hours=6),
-                    "duration_minutes": 60,
-                },
-                {
-                    "start_time": datetime.utcnow() + timedelta(hours=7),
-                    "end_time": datetime.utcnow() + timedelta(hours=8),
-                    "duration_minutes": 60,
-                },
-            ]
-        )
+    @pytest.mark.parametrize("method,ret,kwargs,check", MOCK_FLOW_CASES)
+    async def test_mock_flow(self, mock_calendar_service, method, ret, kwargs, check):
+        """Test a single calendar service call returns the configured payload."""
+        stub = getattr(mock_calendar_service, method)
+        if ret is not None:
+            stub.return_value = ret
 
-        slots = await mock_calendar_service.find_available_slots(
-            duration_minutes=60,
-            date_from=datetime.utcnow(),
-            date_to=datetime.utcnow() + timedelta(days=1),
-        )
+        result = await stub(**kwargs)
 
-        assert len(slots) == 2
-        assert all(slot["duration_minutes"] == 60 for slot in slots)
+        assert check(result)
+        assert stub.call_count == 1
 
-    @pytest.mark.asyncio
     async def test_meeting_scheduling_with_conflict_resolution(self, mock_calendar_service):
         """Test scheduling a meeting with automatic conflict resolution."""
-        mock_calendar_service.check_conflicts = AsyncMock(
-            return_value=[
-                {
-                    "id": "conflict1",
-                    "title": "Conflicting Meeting",
-                    "start_time": datetime.utcnow() + timedelta(hours=1),
-                    "end_time": datetime.utcnow() + timedelta(hours=2),
-                }
-            ]
-        )
-        mock_calendar_service.find_available_slots = AsyncMock(
-            return_value=[
-                {
-                    "start_time": datetime.utcnow() + timedelta(hours=3),
-                    "end_time": datetime.utcnow() + timedelta(hours=4),
-                    "duration_minutes": 60,
-                }
-            ]
-        )
+        now = datetime.utcnow()
+        mock_calendar_service.check_conflicts.return_value = [
+            {
+                "id": "conflict1",
+                "title": "Conflicting Meeting",
+                "start_time": now + timedelta(hours=1),
+                "end_time": now + timedelta(hours=2),
+            }
+        ]
+        mock_calendar_service.find_available_slots.return_value = [
+            {
+                "start_time": now + timedelta(hours=3),
+                "end_time": now + timedelta(hours=4),
+                "duration_minutes": 60,
+            }
+        ]
 
-        requested_time = datetime.utcnow() + timedelta(hours=1)
+        requested_time = now + timedelta(hours=1)
         conflicts = await mock_calendar_service.check_conflicts(
             start_time=requested_time,
             end_time=requested_time + timedelta(hours=1),
@@ -144,46 +141,26 @@ class TestCalendarFlow:
         if conflicts:
             alternative_slots = await mock_calendar_service.find_available_slots(
                 duration_minutes=60,
-                date_from=datetime.utcnow(),
-                date_to=datetime.utcnow() + timedelta(days=1),
+                date_from=now,
+                date_to=now + timedelta(days=1),
             )
             assert len(alternative_slots) > 0
 
-    @pytest.mark.asyncio
-    async def test_recurring_event_handling(self, mock_calendar_service):
-        """Test handling of recurring events."""
-        recurring_event = {
-            "id": "recurring1",
-            "title": "Weekly Standup",
-            "start_time": datetime.utcnow(),
-            "end_time": datetime.utcnow() + timedelta(minutes=30),
-            "is_recurring": True,
-            "recurrence_rule": "FREQ=WEEKLY;BYDAY=MO,WE,FR",
-        }
-
-        mock_calendar_service.create_event = AsyncMock(return_value=recurring_event)
-
-        result = await mock_calendar_service.create_event(recurring_event)
-
-        assert result["is_recurring"] is True
-        assert "WEEKLY" in result["recurrence_rule"]
-
-    @pytest.mark.asyncio
     async def test_event_reminder_scheduling(self, mock_calendar_service):
         """Test scheduling reminders for events."""
+        now = datetime.utcnow()
         event = {
             "id": "event1",
             "title": "Important Meeting",
-            "start_time": datetime.utcnow() + timedelta(hours=1),
+            "start_time": now + timedelta(hours=1),
             "reminder_minutes": 15,
         }
 
         reminder_time = event["start_time"] - timedelta(minutes=event["reminder_minutes"])
-        should_remind = datetime.utcnow() >= reminder_time
+        should_remind = now >= reminder_time
 
         assert isinstance(should_remind, bool)
 
-    @pytest.mark.asyncio
     async def test_working_hours_respect(self, mock_calendar_service):
         """Test that scheduling respects working hours."""
         working_hours = {
@@ -192,74 +169,76 @@ class TestCalendarFlow:
             "days": [0, 1, 2, 3, 4],
         }
 
+        compiled = self._compile_working_hours(working_hours)
+
         requested_time = datetime(2024, 1, 15, 20, 0)
-        is_within_working_hours = self._is_within_working_hours(
-            requested_time, working_hours
-        )
+        is_within_working_hours = self._is_within_working_hours(requested_time, compiled)
 
         assert is_within_working_hours is False
 
-    def _is_within_working_hours(self, time: datetime, working_hours: dict) -> bool:
-        """Check if time is within working hours."""
-        if time.weekday() not in working_hours["days"]:
-            return False
-
+    def _compile_working_hours(self, working_hours: dict) -> tuple:
+        """Parse working hours once into minute-of-day bounds and a weekday set."""
         start_hour, start_min = map(int, working_hours["start"].split(":"))
         end_hour, end_min = map(int, working_hours["end"].split(":"))
+        days = frozenset(working_hours["days"])
+        return start_hour * 60 + start_min, end_hour * 60 + end_min, days
 
-        start_time = time.replace(hour=start_hour, minute=start_min)
-        end_time = time.replace(hour=end_hour, minute=end_min)
+    def _is_within_working_hours(self, time: datetime, compiled: tuple) -> bool:
+        """Check if time is within precompiled working hours."""
+        start, end, days = compiled
+        return time.weekday() in days and start <= time.hour * 60 + time.minute <= end
 
-        return start_time <= time <= end_time
-
-    @pytest.mark.asyncio
     async def test_buffer_time_between_meetings(self, mock_calendar_service):
         """Test buffer time enforcement between meetings."""
+        now = datetime.utcnow()
         buffer_minutes = 15
         existing_events = [
             {
                 "id": "event1",
-                "end_time": datetime.utcnow() + timedelta(hours=1),
+                "end_time": now + timedelta(hours=1),
             }
         ]
+        sorted_end_times = self._prepare_buffers(existing_events)
 
-        new_event_start = datetime.utcnow() + timedelta(hours=1, minutes=5)
+        new_event_start = now + timedelta(hours=1, minutes=5)
         has_buffer = self._has_sufficient_buffer(
-            existing_events, new_event_start, buffer_minutes
+            sorted_end_times, new_event_start, buffer_minutes
         )
 
         assert has_buffer is False
 
+    def _prepare_buffers(self, events: list) -> list:
+        """Sort event end times once so buffer checks can bisect."""
+        return sorted(event["end_time"] for event in events)
+
     def _has_sufficient_buffer(
-        self, existing_events: list, new_start: datetime, buffer_minutes: int
+        self, sorted_end_times: list, new_start: datetime, buffer_minutes: int
     ) -> bool:
-        """Check if there's sufficient buffer time."""
-        for event in existing_events:
-            time_diff = (new_start - event["end_time"]).total_seconds() / 60
-            if 0 < time_diff < buffer_minutes:
-                return False
-        return True
+        """Check if there's sufficient buffer time after the latest earlier event."""
+        i = bisect.bisect_left(sorted_end_times, new_start) - 1
+        if i < 0:
+            return True
+        time_diff = (new_start - sorted_end_times[i]).total_seconds() / 60
+        return time_diff >= buffer_minutes
 
-    @pytest.mark.asyncio
     async def test_today_events_summary(self, mock_calendar_service):
         """Test getting today's events summary."""
         today = datetime.utcnow().date()
-        mock_calendar_service.get_events = AsyncMock(
-            return_value=[
-                {
-                    "id": "event1",
-                    "title": "Morning Standup",
-                    "start_time": datetime.combine(today, datetime.min.time().replace(hour=9)),
-                },
-                {
-                    "id": "event2",
-                    "title": "Lunch Meeting",
-                    "start_time": datetime.combine(today, datetime.min.time().replace(hour=12)),
-                },
-            ]
-        )
+        mock_calendar_service.get_events.return_value = [
+            {
+                "id": "event1",
+                "title": "Morning Standup",
+                "start_time": datetime(today.year, today.month, today.day, 9),
+            },
+            {
+                "id": "event2",
+                "title": "Lunch Meeting",
+                "start_time": datetime(today.year, today.month, today.day, 12),
+            },
+        ]
 
         events = await mock_calendar_service.get_events()
-        today_events = [e for e in events if e["start_time"].date() == today]
+        today_ordinal = today.toordinal()
+        today_events = [e for e in events if e["start_time"].toordinal() == today_ordinal]
 
         assert len(today_events) == 2
@@ -3,15 +3,24 @@ Integration tests for email flow.
 Tests the complete flow from email sync to draft generation.
 """
 
+from __future__ import annotations
+
+import asyncio
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
-from datetime import datetime
+from unittest.mock import AsyncMock
+from datetime import datetime, timedelta
+
+
+def _set_returns(mock_obj, **return_values) -> None:
+    """Set ``return_value`` on existing async stubs instead of replacing them."""
+    for name, value in return_values.items():
+        getattr(mock_obj, name).return_value = value
 
 
 class TestEmailFlow:
     """Integration tests for email processing flow."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_services(self, mock_email_service, mock_llm_service, mock_rag_service):
         """Bundle all mock services."""
         return {
@@ -20,7 +29,6 @@ class TestEmailFlow:
             "rag": mock_rag_service,
         }
 
-    @pytest.mark.asyncio
     async def test_complete_email_sync_flow(self, mock_services):
         """Test complete email sync flow."""
         mock_services["email"].fetch_emails = AsyncMock(
@@ -40,7 +48,6 @@ class TestEmailFlow:
         assert len(emails) == 1
         assert emails[0]["subject"] == "Important Meeting"
 
-    @pytest.mark.asyncio
     async def test_email_classification_flow(self, mock_services):
         """Test email classification after sync."""
         email = {
@@ -60,7 +67,6 @@ class TestEmailFlow:
 
         assert category == "urgent"
 
-    @pytest.mark.asyncio
     async def test_email_indexing_flow(self, mock_services):
         """Test email indexing in RAG after classification."""
         email = {
@@ -74,9 +80,8 @@ class TestEmailFlow:
         result = await mock_services["rag"].index_email(email)
 
         assert result is True
-        mock_services["rag"].index_email.assert_called_once()
+        assert mock_services["rag"].index_email.call_count == 1
 
-    @pytest.mark.asyncio
     async def test_draft_generation_flow(self, mock_services):
         """Test draft generation for an email."""
         email = {
@@ -98,7 +103,6 @@ class TestEmailFlow:
         assert "December 15th" in draft
         assert len(draft) > 20
 
-    @pytest.mark.asyncio
     async def test_draft_approval_and_send_flow(self, mock_services):
         """Test draft approval and sending flow."""
         draft = {
@@ -117,13 +121,13 @@ class TestEmailFlow:
         )
 
         assert result is True
-        mock_services["email"].send_email.assert_called_once()
+        assert mock_services["email"].send_email.call_count == 1
 
-    @pytest.mark.asyncio
     async def test_full_email_to_draft_pipeline(self, mock_services):
         """Test the complete pipeline from email receipt to draft generation."""
-        mock_services["email"].fetch_emails = AsyncMock(
-            return_value=[
+        _set_returns(
+            mock_services["email"],
+            fetch_emails=[
                 {
                     "id": "email1",
                     "subject": "Meeting Request",
@@ -131,13 +135,14 @@ class TestEmailFlow:
                     "sender": "partner@company.com",
                     "received_at": datetime.utcnow(),
                 }
-            ]
+            ],
         )
-        mock_services["llm"].classify_email = AsyncMock(return_value="to_respond")
-        mock_services["rag"].index_email = AsyncMock(return_value=True)
-        mock_services["llm"].generate_draft = AsyncMock(
-            return_value="I would be happy to schedule a call. How about Tuesday at 2 PM?"
+        _set_returns(
+            mock_services["llm"],
+            classify_email="to_respond",
+            generate_draft="I would be happy to schedule a call. How about Tuesday at 2 PM?",
         )
+        _set_returns(mock_services["rag"], index_email=True)
 
         emails = await mock_services["email"].fetch_emails()
         email = emails[0]
@@ -148,17 +153,20 @@ class TestEmailFlow:
             sender=email["sender"],
         )
 
-        await mock_services["rag"].index_email({**email, "category": category})
-
-        draft = await mock_services["llm"].generate_draft(
-            email=email,
-            tone="friendly",
-        )
+        # Indexing and drafting both only need the classification, so run them together.
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(mock_services["rag"].index_email({**email, "category": category}))
+            draft_task = tg.create_task(
+                mock_services["llm"].generate_draft(
+                    email=email,
+                    tone="friendly",
+                )
+            )
+        draft = draft_task.result()
 
         assert category == "to_respond"
         assert "Tuesday" in draft or "call" in draft.lower()
 
-    @pytest.mark.asyncio
     async def test_email_search_via_rag(self, mock_services):
         """Test searching emails via RAG."""
         mock_services["rag"].query = AsyncMock(
@@ -183,7 +191,6 @@ class TestEmailFlow:
         assert len(result["sources"]) > 0
         assert result["confidence"] > 0.5
 
-    @pytest.mark.asyncio
     async def test_follow_up_reminder_flow(self, mock_services):
         """Test follow-up reminder generation for unanswered emails."""
         unanswered_emails = [
@@ -196,30 +203,34 @@ class TestEmailFlow:
             }
         ]
 
-        follow_ups = self._generate_follow_up_reminders(unanswered_emails, days_threshold=3)
+        follow_ups = self._generate_follow_up_reminders(
+            unanswered_emails, days_threshold=3, now=datetime.utcnow()
+        )
 
         assert len(follow_ups) == 1
         assert follow_ups[0]["email_id"] == "email1"
 
-    def _generate_follow_up_reminders(self, emails: list, days_threshold: int) -> list:
-        """Generate follow-up reminders for unanswered emails."""
+    def _generate_follow_up_reminders(
+        self, emails: list, days_threshold: int, now: datetime
+    ) -> list:
+        """Generate follow-up reminders for unanswered emails as of ``now``."""
+        cutoff = now - timedelta(days=days_threshold)
         reminders = []
-        now = datetime.utcnow()
 
         for email in emails:
-            if not email.get("has_response", True):
-                days_since = (now - email["received_at"]).days
-                if days_since >= days_threshold:
-                    reminders.append({
-                        "email_id": email["id"],
-                        "subject": email["subject"],
-                        "sender": email["sender"],
-                        "days_since": days_since,
-                    })
+            if email.get("has_response", True):
+                continue
+            received_at = email["received_at"]
+            if received_at <= cutoff:
+                reminders.append({
+                    "email_id": email["id"],
+                    "subject": email["subject"],
+                    "sender": email["sender"],
+                    "days_since": (now - received_at).days,
+                })
 
         return reminders
 
-    @pytest.mark.asyncio
     async def test_batch_email_processing(self, mock_services):
         """Test batch processing of multiple emails."""
         emails = [
@@ -229,14 +240,20 @@ class TestEmailFlow:
 
         mock_services["llm"].classify_email = AsyncMock(return_value="fyi")
 
-        results = []
-        for email in emails:
-            category = await mock_services["llm"].classify_email(
-                subject=email["subject"],
-                body=email["body"],
-                sender="sender@example.com",
+        categories = await asyncio.gather(
+            *(
+                mock_services["llm"].classify_email(
+                    subject=email["subject"],
+                    body=email["body"],
+                    sender="sender@example.com",
+                )
+                for email in emails
             )
-            results.append({"email_id": email["id"], "category": category})
+        )
+        results = [
+            {"email_id": email["id"], "category": category}
+            for email, category in zip(emails, categories)
+        ]
 
         assert len(results) == 10
         assert all(r["category"] == "fyi" for r in results)
@@ -3,15 +3,26 @@ Integration tests for meeting flow.
 Tests meeting creation, transcription, summarization, and follow-up.
 """
 
+from __future__ import annotations
+
+import re
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock
 from datetime import datetime
 
+# Each match spans the whole line containing a keyword, so one finditer pass extracts lines.
+_ACTION_RE = re.compile(
+    r"^[^\n]*\b(?:will|can you|need to|should|must)\b[^\n]*", re.IGNORECASE | re.MULTILINE
+)
+_DECISION_RE = re.compile(
+    r"^[^\n]*\b(?:decided|agreed|confirmed|final decision)\b[^\n]*", re.IGNORECASE | re.MULTILINE
+)
+
 
 class TestMeetingFlow:
     """Integration tests for meeting functionality."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def mock_services(self, mock_transcription_service, mock_llm_service, mock_rag_service):
         """Bundle all mock services."""
         return {
@@ -20,7 +31,6 @@ class TestMeetingFlow:
             "rag": mock_rag_service,
         }
 
-    @pytest.mark.asyncio
     async def test_meeting_creation_flow(self):
         """Test meeting creation flow."""
         meeting = {
@@ -35,7 +45,6 @@ class TestMeetingFlow:
         assert meeting["status"] == "pending"
         assert len(meeting["participants"]) == 2
 
-    @pytest.mark.asyncio
     async def test_audio_transcription_flow(self, mock_services):
         """Test audio transcription flow."""
         mock_services["transcription"].transcribe = AsyncMock(
@@ -58,7 +67,6 @@ class TestMeetingFlow:
         assert "Bob" in result["text"]
         assert len(result["segments"]) == 2
 
-    @pytest.mark.asyncio
     async def test_meeting_summarization_flow(self, mock_services):
         """Test meeting summarization flow."""
         transcript = """
@@ -90,7 +98,6 @@ class TestMeetingFlow:
         assert len(result["action_items"]) > 0
         assert len(result["key_decisions"]) > 0
 
-    @pytest.mark.asyncio
     async def test_meeting_indexing_flow(self, mock_services):
         """Test meeting indexing in RAG."""
         meeting = {
@@ -107,7 +114,6 @@ class TestMeetingFlow:
 
         assert result is True
 
-    @pytest.mark.asyncio
     async def test_follow_up_email_generation(self, mock_services):
         """Test follow-up email generation after meeting."""
         meeting_summary = {
@@ -147,7 +153,6 @@ Best regards
         assert "Follow-up" in email
         assert "Action Items" in email
 
-    @pytest.mark.asyncio
     async def test_complete_meeting_pipeline(self, mock_services):
         """Test complete meeting pipeline from audio to follow-up."""
         mock_services["transcription"].transcribe = AsyncMock(
@@ -187,7 +192,6 @@ Best regards
         assert summary_result["summary"] is not None
         assert follow_up is not None
 
-    @pytest.mark.asyncio
     async def test_speaker_diarization(self, mock_services):
         """Test speaker diarization in transcription."""
         mock_services["transcription"].transcribe_with_diarization = AsyncMock(
@@ -206,7 +210,6 @@ Best regards
 
         assert len(result["speakers"]) == 2
 
-    @pytest.mark.asyncio
     async def test_language_detection_in_transcription(self, mock_services):
         """Test automatic language detection during transcription."""
         mock_services["transcription"].detect_language = AsyncMock(return_value="ro")
@@ -217,7 +220,6 @@ Best regards
 
         assert language == "ro"
 
-    @pytest.mark.asyncio
     async def test_meeting_search_via_rag(self, mock_services):
         """Test searching meeting content via RAG."""
         mock_services["rag"].query = AsyncMock(
@@ -257,16 +259,7 @@ Best regards
 
     def _extract_action_items(self, transcript: str) -> list:
         """Extract action items from transcript (simplified)."""
-        action_keywords = ["will", "can you", "need to", "should", "must"]
-        lines = transcript.strip().split("\n")
-        action_items = []
-
-        for line in lines:
-            line_lower = line.lower()
-            if any(keyword in line_lower for keyword in action_keywords):
-                action_items.append(line.strip())
-
-        return action_items
+        return [match.group(0).strip() for match in _ACTION_RE.finditer(transcript)]
 
     def test_extract_key_decisions_from_transcript(self):
         """Test extracting key decisions from transcript."""
@@ -282,13 +275,4 @@ Best regards
 
     def _extract_decisions(self, transcript: str) -> list:
         """Extract decisions from transcript (simplified)."""
-        decision_keywords = ["decided", "agreed", "confirmed", "final decision"]
-        lines = transcript.strip().split("\n")
-        decisions = []
-
-        for line in lines:
-            line_lower = line.lower()
-            if any(keyword in line_lower for keyword in decision_keywords):
-                decisions.append(line.strip())
-
-        return decisions
+        return [match.group(0).strip() for match in _DECISION_RE.finditer(transcript)]
@@ -3,114 +3,107 @@ Unit tests for email classification logic.
 Tests the email categorization into: urgent, to_respond, fyi, newsletter, spam
 """
 
+import asyncio
+import re
 import pytest
+from types import MappingProxyType
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from app.services.llm_service import LLMService
+
+PRIORITY_SCORES = {
+    "urgent": 100,
+    "to_respond": 75,
+    "fyi": 50,
+    "newsletter": 25,
+    "spam": 0,
+}
+
+ROMANIAN_INDICATORS = ["ă", "î", "ș", "ț", "â", "bună", "ziua", "mulțumesc"]
+_ROMANIAN_RE = re.compile("|".join(map(re.escape, ROMANIAN_INDICATORS)))
+# All-ASCII text can only match the indicators that are themselves ASCII.
+_ROMANIAN_ASCII_RE = re.compile(
+    "|".join(re.escape(indicator) for indicator in ROMANIAN_INDICATORS if indicator.isascii())
+)
+_POSITIVE_RE = re.compile(
+    r"\b(?:thanks?|wonderful|great|excellent|happy|pleased)\b", re.IGNORECASE
+)
+_NEGATIVE_RE = re.compile(
+    r"\b(?:disappointed|unacceptable|terrible|angry|frustrated)\b", re.IGNORECASE
+)
+
 
 class TestEmailClassification:
     """Tests for email classification functionality."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def classification_prompts(self):
         """Sample emails for classification testing."""
-        return {
-            "urgent": {
-                "subject": "URGENT: Server down - immediate action required",
-                "body": "The production server is down. We need to fix this immediately. All hands on deck!",
-                "sender": "ops@company.com",
-            },
-            "to_respond": {
-                "subject": "Question about the project timeline",
-                "body": "Hi, could you please let me know when the project will be completed? Thanks!",
-                "sender": "client@customer.com",
-            },
-            "fyi": {
-                "subject": "FYI: Updated company policies",
-                "body": "Please find attached the updated company policies for your reference.",
-                "sender": "hr@company.com",
-            },
-            "newsletter": {
-                "subject": "Weekly Tech Newsletter - Issue #42",
-                "body": "Welcome to this week's newsletter! Here are the top stories...",
-                "sender": "newsletter@techsite.com",
-            },
-            "spam": {
-                "subject": "You've won $1,000,000!!!",
-                "body": "Click here to claim your prize! Limited time offer!",
-                "sender": "winner@suspicious-domain.xyz",
-            },
-        }
-
-    @pytest.mark.asyncio
-    async def test_classify_urgent_email(self, classification_prompts, mock_llm_service):
-        """Test classification of urgent emails."""
-        email = classification_prompts["urgent"]
-        mock_llm_service.classify_email = AsyncMock(return_value="urgent")
-
-        result = await mock_llm_service.classify_email(
-            subject=email["subject"],
-            body=email["body"],
-            sender=email["sender"],
+        return MappingProxyType(
+            {
+                "urgent": {
+                    "subject": "URGENT: Server down - immediate action required",
+                    "body": "The production server is down. We need to fix this immediately. All hands on deck!",
+                    "sender": "ops@company.com",
+                },
+                "to_respond": {
+                    "subject": "Question about the project timeline",
+                    "body": "Hi, could you please let me know when the project will be completed? Thanks!",
+                    "sender": "client@customer.com",
+                },
+                "fyi": {
+                    "subject": "FYI: Updated company policies",
+                    "body": "Please find attached the updated company policies for your reference.",
+                    "sender": "hr@company.com",
+                },
+                "newsletter": {
+                    "subject": "Weekly Tech Newsletter - Issue #42",
+                    "body": "Welcome to this week's newsletter! Here are the top stories...",
+                    "sender": "newsletter@techsite.com",
+                },
+                "spam": {
+                    "subject": "You've won $1,000,000!!!",
+                    "body": "Click here to claim your prize! Limited time offer!",
+                    "sender": "winner@suspicious-domain.xyz",
+                },
+            }
         )
 
-        assert result == "urgent"
-        mock_llm_service.classify_email.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_classify_to_respond_email(self, classification_prompts, mock_llm_service):
-        """Test classification of emails requiring response."""
-        email = classification_prompts["to_respond"]
-        mock_llm_service.classify_email = AsyncMock(return_value="to_respond")
-
-        result = await mock_llm_service.classify_email(
-            subject=email["subject"],
-            body=email["body"],
-            sender=email["sender"],
-        )
-
-        assert result == "to_respond"
-
-    @pytest.mark.asyncio
-    async def test_classify_fyi_email(self, classification_prompts, mock_llm_service):
-        """Test classification of FYI emails."""
-        email = classification_prompts["fyi"]
-        mock_llm_service.classify_email = AsyncMock(return_value="fyi")
-
-        result = await mock_llm_service.classify_email(
-            subject=email["subject"],
-            body=email["body"],
-            sender=email["sender"],
+    async def test_classify_emails_by_category(self, classification_prompts, mock_llm_service):
+        """Test classification of each category, issued as one concurrent batch."""
+        category_by_subject = {
+            email["subject"]: category for category, email in classification_prompts.items()
+        }
+        mock_llm_service.classify_email = AsyncMock(
+            side_effect=lambda subject, body, sender: category_by_subject[subject]
         )
 
-        assert result == "fyi"
-
-    @pytest.mark.asyncio
-    async def test_classify_newsletter_email(self, classification_prompts, mock_llm_service):
-        """Test classification of newsletter emails."""
-        email = classification_prompts["newsletter"]
-        mock_llm_service.classify_email = AsyncMock(return_value="newsletter")
-
-        result = await mock_llm_service.classify_email(
-            subject=email["subject"],
-            body=email["body"],
-            sender=email["sender"],
+        results = await asyncio.gather(
+            *(
+                mock_llm_service.classify_email(
+                    subject=email["subject"],
+                    body=email["body"],
+                    sender=email["sender"],
+                )
+                for email in classification_prompts.values()
+            )
         )
 
-        assert result == "newsletter"
+        assert results == list(classification_prompts)
+        assert mock_llm_service.classify_email.call_count == len(classification_prompts)
 
-    @pytest.mark.asyncio
-    async def test_classify_spam_email(self, classification_prompts, mock_llm_service):
-        """Test classification of spam emails."""
-        email = classification_prompts["spam"]
-        mock_llm_service.classify_email = AsyncMock(return_value="spam")
+    async def test_classification_is_cached_per_email(self, classification_prompts):
+        """Test that re-classifying the same email reuses the cached LLM result."""
+        service = LLMService()
+        service.generate = AsyncMock(return_value='{"category": "urgent", "language": "en"}')
+        urgent, spam = classification_prompts["urgent"], classification_prompts["spam"]
 
-        result = await mock_llm_service.classify_email(
-            subject=email["subject"],
-            body=email["body"],
-            sender=email["sender"],
-        )
+        first = await service.classify_email(**urgent)
+        second = await service.classify_email(**urgent)
+        await service.classify_email(**spam)
 
-        assert result == "spam"
+        assert first == second == {"category": "urgent", "language": "en"}
+        assert service.generate.call_count == 2
 
     def test_priority_score_calculation(self):
         """Test email priority score calculation based on category."""
@@ -128,14 +121,7 @@ class TestEmailClassification:
 
     def _calculate_priority_score(self, category: str) -> int:
         """Helper to calculate priority score."""
-        scores = {
-            "urgent": 100,
-            "to_respond": 75,
-            "fyi": 50,
-            "newsletter": 25,
-            "spam": 0,
-        }
-        return scores.get(category, 50)
+        return PRIORITY_SCORES.get(category, 50)
 
     def test_language_detection(self):
         """Test language detection for emails."""
@@ -147,13 +133,8 @@ class TestEmailClassification:
 
     def _detect_language(self, text: str) -> str:
         """Simple language detection helper."""
-        romanian_indicators = ["ă", "î", "ș", "ț", "â", "bună", "ziua", "mulțumesc"]
-        text_lower = text.lower()
-
-        for indicator in romanian_indicators:
-            if indicator in text_lower:
-                return "ro"
-        return "en"
+        pattern = _ROMANIAN_ASCII_RE if text.isascii() else _ROMANIAN_RE
+        return "ro" if pattern.search(text.lower()) else "en"
 
     def test_sentiment_analysis(self):
         """Test basic sentiment analysis for emails."""
@@ -167,12 +148,8 @@ class TestEmailClassification:
 
     def _analyze_sentiment(self, text: str) -> str:
         """Simple sentiment analysis helper."""
-        positive_words = ["thank", "wonderful", "great", "excellent", "happy", "pleased"]
-        negative_words = ["disappointed", "unacceptable", "terrible", "angry", "frustrated"]
-
-        text_lower = text.lower()
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
+        positive_count = len(_POSITIVE_RE.findall(text))
+        negative_count = len(_NEGATIVE_RE.findall(text))
 
         if positive_count > negative_count:
             return "positive"
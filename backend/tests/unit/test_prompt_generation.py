@@ -4,42 +4,75 @@ Tests the generation of prompts for LLM interactions.
 """
 
 import pytest
+from types import MappingProxyType
 from unittest.mock import AsyncMock, MagicMock
 
+LANGUAGE_NAMES = {"en": "English", "ro": "Romanian"}
+
+# One draft template per language with the language name already baked in.
+LANGUAGE_DRAFT_TEMPLATES = {
+    code: (
+        f"Generate a reply to the following email in {name}:\n\n"
+        "Subject: {subject}\nFrom: {sender}\nBody: {body}\n\n"
+        f"Reply in {name}:"
+    )
+    for code, name in LANGUAGE_NAMES.items()
+}
+
+RAG_PROMPT_HEADER = """Answer the following question based on the provided context documents.
+If the answer cannot be found in the context, say "I don't have enough information to answer this question."
+
+Context Documents:
+"""
+
+FOLLOW_UP_PROMPT_FOOTER = """
+
+The email should:
+1. Thank participants for attending
+2. Summarize key discussion points
+3. List action items with owners
+4. Mention next steps or follow-up meeting if applicable
+
+Follow-up Email:"""
+
 
 class TestPromptGeneration:
     """Tests for prompt generation functionality."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def email_context(self):
         """Sample email context for draft generation."""
-        return {
-            "subject": "Question about project timeline",
-            "sender": "client@customer.com",
-            "sender_name": "John Smith",
-            "body": "Hi, I wanted to follow up on our discussion. When will the project be completed?",
-            "received_at": "2024-01-15 10:30:00",
-            "thread_history": [
-                {
-                    "sender": "me@company.com",
-                    "body": "We are working on it and will update you soon.",
-                    "date": "2024-01-14 15:00:00",
-                }
-            ],
-        }
+        return MappingProxyType(
+            {
+                "subject": "Question about project timeline",
+                "sender": "client@customer.com",
+                "sender_name": "John Smith",
+                "body": "Hi, I wanted to follow up on our discussion. When will the project be completed?",
+                "received_at": "2024-01-15 10:30:00",
+                "thread_history": [
+                    {
+                        "sender": "me@company.com",
+                        "body": "We are working on it and will update you soon.",
+                        "date": "2024-01-14 15:00:00",
+                    }
+                ],
+            }
+        )
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def user_style_profile(self):
         """Sample user writing style profile."""
-        return {
-            "tone": "professional",
-            "formality": "formal",
-            "greeting_style": "Dear [Name],",
-            "closing_style": "Best regards,",
-            "signature": "John Doe\nProject Manager",
-            "typical_length": "medium",
-            "language_preference": "en",
-        }
+        return MappingProxyType(
+            {
+                "tone": "professional",
+                "formality": "formal",
+                "greeting_style": "Dear [Name],",
+                "closing_style": "Best regards,",
+                "signature": "John Doe\nProject Manager",
+                "typical_length": "medium",
+                "language_preference": "en",
+            }
+        )
 
     def test_draft_prompt_generation(self, email_context, user_style_profile):
         """Test generation of draft email prompt."""
@@ -153,21 +186,13 @@ Summary:"""
 
     def _generate_rag_prompt(self, query: str, context_docs: list) -> str:
         """Generate a prompt for RAG-based Q&A."""
-        context_text = "\n\n".join(
-            f"Document: {doc['title']}\nContent: {doc['content']}"
-            for doc in context_docs
-        )
-
-        prompt = f"""Answer the following question based on the provided context documents.
-If the answer cannot be found in the context, say "I don't have enough information to answer this question."
-
-Context Documents:
-{context_text}
-
-Question: {query}
-
-Answer:"""
-        return prompt
+        parts = [RAG_PROMPT_HEADER]
+        for doc in context_docs:
+            parts += ("Document: ", doc["title"], "\nContent: ", doc["content"], "\n\n")
+        if not context_docs:
+            parts.append("\n\n")
+        parts += ("Question: ", query, "\n\nAnswer:")
+        return "".join(parts)
 
     def test_follow_up_email_prompt_generation(self):
         """Test generation of follow-up email prompt."""
@@ -190,27 +215,23 @@ Answer:"""
 
     def _generate_follow_up_prompt(self, meeting_summary: dict) -> str:
         """Generate a prompt for follow-up email after meeting."""
-        action_items_text = "\n".join(f"- {item}" for item in meeting_summary["action_items"])
-
-        prompt = f"""Generate a professional follow-up email for the following meeting:
-
-Meeting: {meeting_summary['title']}
-Date: {meeting_summary['date']}
-Participants: {', '.join(meeting_summary['participants'])}
-
-Summary: {meeting_summary['summary']}
-
-Action Items:
-{action_items_text}
-
-The email should:
-1. Thank participants for attending
-2. Summarize key discussion points
-3. List action items with owners
-4. Mention next steps or follow-up meeting if applicable
-
-Follow-up Email:"""
-        return prompt
+        parts = [
+            "Generate a professional follow-up email for the following meeting:\n\nMeeting: ",
+            meeting_summary["title"],
+            "\nDate: ",
+            meeting_summary["date"],
+            "\nParticipants: ",
+            ", ".join(meeting_summary["participants"]),
+            "\n\nSummary: ",
+            meeting_summary["summary"],
+            "\n\nAction Items:",
+        ]
+        for item in meeting_summary["action_items"]:
+            parts += ("\n- ", item)
+        if not meeting_summary["action_items"]:
+            parts.append("\n")
+        parts.append(FOLLOW_UP_PROMPT_FOOTER)
+        return "".join(parts)
 
     def test_prompt_language_adaptation(self):
         """Test that prompts can be adapted for different languages."""
@@ -228,15 +249,8 @@ Follow-up Email:"""
 
     def _generate_draft_prompt_with_language(self, email: dict, language: str) -> str:
         """Generate a draft prompt with language specification."""
-        lang_name = "English" if language == "en" else "Romanian"
-        prompt = f"""Generate a reply to the following email in {lang_name}:
-
-Subject: {email['subject']}
-From: {email['sender']}
-Body: {email['body']}
-
-Reply in {lang_name}:"""
-        return prompt
+        template = LANGUAGE_DRAFT_TEMPLATES.get(language, LANGUAGE_DRAFT_TEMPLATES["ro"])
+        return template.format_map(email)
 
     def test_tone_variations(self):
         """Test prompt generation with different tone settings."""
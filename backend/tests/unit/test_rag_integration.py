@@ -3,18 +3,80 @@ Unit tests for RAG (Retrieval Augmented Generation) integration.
 Tests the knowledge graph and vector search functionality.
 """
 
+import re
 import pytest
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import List
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
 
+import numpy as np
+
+# Fixed clock for mock payloads, so tests are deterministic and skip the clock read.
+FIXED_NOW = datetime(2024, 1, 15, 12, 0, 0)
+
+COMMON_KEYWORDS = ["project", "deadline", "q4", "goals"]
+
+ENTITY_PATTERNS = {
+    "John Smith": "persons",
+    "Sarah Johnson": "persons",
+    "Acme Corp": "organizations",
+    "Alpha Project": "projects",
+}
+# Longest first so a pattern that prefixes another never shadows it in the alternation.
+_ENTITY_RE = re.compile("|".join(map(re.escape, sorted(ENTITY_PATTERNS, key=len, reverse=True))))
+
+
+def keyword_mask(content: str) -> int:
+    """Bitmask with bit ``k`` set when ``COMMON_KEYWORDS[k]`` occurs in ``content``."""
+    content = content.lower()
+    return sum(1 << k for k, keyword in enumerate(COMMON_KEYWORDS) if keyword in content)
+
+
+@dataclass
+class DocumentTable:
+    """Column-oriented view of a document list, so scans touch only the fields they need."""
+
+    ids: List[str]
+    types: List[str]
+    titles: List[str]
+    contents: List[str]
+    metadata: List[dict]
+    keyword_masks: List[int]
+
+    @classmethod
+    def from_docs(cls, documents: list) -> "DocumentTable":
+        return cls(
+            ids=[doc["id"] for doc in documents],
+            types=[doc["type"] for doc in documents],
+            titles=[doc["title"] for doc in documents],
+            contents=[doc["content"] for doc in documents],
+            metadata=[doc.get("metadata", {}) for doc in documents],
+            keyword_masks=[keyword_mask(doc["content"]) for doc in documents],
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row(self, i: int) -> dict:
+        """Rebuild the document dict at index ``i``."""
+        return {
+            "id": self.ids[i],
+            "type": self.types[i],
+            "title": self.titles[i],
+            "content": self.contents[i],
+            "metadata": self.metadata[i],
+        }
+
 
 class TestRAGIntegration:
     """Tests for RAG functionality."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def sample_documents(self):
         """Sample documents for RAG testing."""
-        return [
+        return (
             {
                 "id": "doc1",
                 "type": "email",
@@ -45,7 +107,12 @@ class TestRAGIntegration:
                     "date": "2024-01-12",
                 },
             },
-        ]
+        )
+
+    @pytest.fixture(scope="session")
+    def document_table(self, sample_documents):
+        """Sample documents in columnar form."""
+        return DocumentTable.from_docs(sample_documents)
 
     @pytest.mark.asyncio
     async def test_query_returns_relevant_results(self, mock_rag_service):
@@ -82,7 +149,7 @@ class TestRAGIntegration:
             "subject": "Important Update",
             "body": "Please review the attached document.",
             "sender": "colleague@company.com",
-            "received_at": datetime.utcnow(),
+            "received_at": FIXED_NOW,
         }
 
         result = await mock_rag_service.index_email(email)
@@ -119,14 +186,8 @@ class TestRAGIntegration:
 
     def _chunk_text(self, text: str, chunk_size: int, overlap: int) -> list:
         """Chunk text into smaller pieces with overlap."""
-        chunks = []
-        start = 0
-        while start < len(text):
-            end = start + chunk_size
-            chunk = text[start:end]
-            chunks.append(chunk)
-            start = end - overlap
-        return chunks
+        step = chunk_size - overlap
+        return [text[start:start + chunk_size] for start in range(0, len(text), step)]
 
     def test_extract_entities_from_text(self):
         """Test entity extraction from text."""
@@ -148,27 +209,14 @@ class TestRAGIntegration:
             "projects": [],
         }
 
-        person_patterns = ["John Smith", "Sarah Johnson"]
-        org_patterns = ["Acme Corp"]
-        project_patterns = ["Alpha Project"]
-
-        for pattern in person_patterns:
-            if pattern in text:
-                entities["persons"].append(pattern)
-
-        for pattern in org_patterns:
-            if pattern in text:
-                entities["organizations"].append(pattern)
-
-        for pattern in project_patterns:
-            if pattern in text:
-                entities["projects"].append(pattern)
+        for name in dict.fromkeys(match.group(0) for match in _ENTITY_RE.finditer(text)):
+            entities[ENTITY_PATTERNS[name]].append(name)
 
         return entities
 
-    def test_build_knowledge_graph_nodes(self, sample_documents):
+    def test_build_knowledge_graph_nodes(self, document_table, sample_documents):
         """Test building knowledge graph nodes from documents."""
-        nodes = self._build_graph_nodes(sample_documents)
+        nodes = self._build_graph_nodes(document_table)
 
         assert len(nodes) == len(sample_documents)
         for node in nodes:
@@ -176,51 +224,38 @@ class TestRAGIntegration:
             assert "type" in node
             assert "properties" in node
 
-    def _build_graph_nodes(self, documents: list) -> list:
+    def _build_graph_nodes(self, table: DocumentTable) -> list:
         """Build knowledge graph nodes from documents."""
-        nodes = []
-        for doc in documents:
-            node = {
-                "id": doc["id"],
-                "type": doc["type"],
+        return [
+            {
+                "id": doc_id,
+                "type": doc_type,
                 "properties": {
-                    "title": doc["title"],
-                    "content_preview": doc["content"][:100],
-                    **doc.get("metadata", {}),
+                    "title": title,
+                    "content_preview": content[:100],
+                    **metadata,
                 },
             }
-            nodes.append(node)
-        return nodes
+            for doc_id, doc_type, title, content, metadata in zip(
+                table.ids, table.types, table.titles, table.contents, table.metadata
+            )
+        ]
 
-    def test_build_knowledge_graph_relationships(self, sample_documents):
+    def test_build_knowledge_graph_relationships(self, document_table):
         """Test building relationships between knowledge graph nodes."""
-        relationships = self._build_graph_relationships(sample_documents)
+        relationships = self._build_graph_relationships(document_table)
 
         assert isinstance(relationships, list)
 
-    def _build_graph_relationships(self, documents: list) -> list:
+    def _build_graph_relationships(self, table: DocumentTable) -> list:
         """Build relationships between documents based on shared entities."""
-        relationships = []
-        for i, doc1 in enumerate(documents):
-            for doc2 in documents[i + 1:]:
-                if self._documents_related(doc1, doc2):
-                    relationships.append({
-                        "source": doc1["id"],
-                        "target": doc2["id"],
-                        "type": "RELATED_TO",
-                    })
-        return relationships
-
-    def _documents_related(self, doc1: dict, doc2: dict) -> bool:
-        """Check if two documents are related."""
-        content1 = doc1["content"].lower()
-        content2 = doc2["content"].lower()
-
-        common_keywords = ["project", "deadline", "q4", "goals"]
-        for keyword in common_keywords:
-            if keyword in content1 and keyword in content2:
-                return True
-        return False
+        masks = np.array(table.keyword_masks, dtype=np.uint64)
+        # Two documents are related when their keyword masks share a bit.
+        related = np.triu(np.bitwise_and.outer(masks, masks) != 0, k=1)
+        return [
+            {"source": table.ids[i], "target": table.ids[j], "type": "RELATED_TO"}
+            for i, j in np.argwhere(related)
+        ]
 
     def test_semantic_search_ranking(self):
         """Test semantic search result ranking."""
@@ -238,19 +273,19 @@ class TestRAGIntegration:
 
     def _rank_results(self, results: list) -> list:
         """Rank search results by relevance score."""
-        return sorted(results, key=lambda x: x["score"], reverse=True)
+        return sorted(results, key=itemgetter("score"), reverse=True)
 
-    def test_filter_results_by_type(self, sample_documents):
+    def test_filter_results_by_type(self, document_table):
         """Test filtering search results by document type."""
-        emails_only = self._filter_by_type(sample_documents, "email")
-        meetings_only = self._filter_by_type(sample_documents, "meeting")
+        emails_only = self._filter_by_type(document_table, "email")
+        meetings_only = self._filter_by_type(document_table, "meeting")
 
         assert all(doc["type"] == "email" for doc in emails_only)
         assert all(doc["type"] == "meeting" for doc in meetings_only)
 
-    def _filter_by_type(self, documents: list, doc_type: str) -> list:
-        """Filter documents by type."""
-        return [doc for doc in documents if doc["type"] == doc_type]
+    def _filter_by_type(self, table: DocumentTable, doc_type: str) -> list:
+        """Filter documents by type, scanning only the type column."""
+        return [table.row(i) for i, t in enumerate(table.types) if t == doc_type]
 
     def test_confidence_score_calculation(self):
         """Test confidence score calculation for RAG answers."""
@@ -265,17 +300,28 @@ class TestRAGIntegration:
 
         high_confidence = self._calculate_confidence(high_relevance_sources)
         low_confidence = self._calculate_confidence(low_relevance_sources)
+        score_array = np.array([s["relevance_score"] for s in high_relevance_sources])
 
         assert high_confidence > low_confidence
         assert 0 <= high_confidence <= 1
         assert 0 <= low_confidence <= 1
+        assert self._calculate_confidence(score_array) == pytest.approx(high_confidence)
+        assert self._calculate_confidence(np.array([])) == 0.0
 
     def _calculate_confidence(self, sources: list) -> float:
-        """Calculate confidence score based on source relevance."""
-        if not sources:
+        """Calculate confidence score based on source relevance.
+
+        ``sources`` is either a list of source dicts or an array of relevance scores.
+        """
+        if len(sources) == 0:
             return 0.0
-        avg_relevance = sum(s["relevance_score"] for s in sources) / len(sources)
-        return min(avg_relevance, 1.0)
+        if isinstance(sources, np.ndarray):
+            scores = sources
+        else:
+            scores = np.fromiter(
+                (s["relevance_score"] for s in sources), dtype=np.float64, count=len(sources)
+            )
+        return min(float(scores.mean()), 1.0)
 
     def test_answer_generation_with_no_context(self):
         """Test answer generation when no relevant context is found."""
@@ -0,0 +1,219 @@
+"""
+Unit tests for RAG indexing task helpers.
+Tests indexing dedupe and text extraction from TXT, DOCX and PDF files.
+"""
+
+import zipfile
+from typing import Dict, List, Optional
+
+import pytest
+from celery.exceptions import Retry
+
+from app.workers.tasks import rag_tasks
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+class FakeRedis:
+    """Just enough of the Redis client for the indexing dedupe keys."""
+
+    def __init__(self):
+        self.ttls: Dict[str, Optional[int]] = {}
+
+    def set(self, key: str, value: str, nx: bool = False, ex: Optional[int] = None):
+        if nx and key in self.ttls:
+            return None
+        self.ttls[key] = ex
+        return True
+
+    def delete(self, key: str) -> int:
+        if key not in self.ttls:
+            return 0
+        del self.ttls[key]
+        return 1
+
+    def expire(self, key: str, seconds: int) -> bool:
+        if key not in self.ttls:
+            return False
+        self.ttls[key] = seconds
+        return True
+
+
+def _finish_with(outcome):
+    """Stand-in for run_async that discards the coroutine and returns or raises ``outcome``."""
+
+    def run(coro):
+        coro.close()
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    return run
+
+
+async def _noop():
+    return None
+
+
+def _write_docx(path, paragraphs: List[str]) -> None:
+    """Write a minimal DOCX whose paragraphs are given as raw WordprocessingML runs."""
+    body = "".join(f"<w:p>{runs}</w:p>" for runs in paragraphs)
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(
+            "word/document.xml",
+            f'<w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>',
+        )
+
+
+def _write_pdf(path, pages: List[str]) -> None:
+    """Write a minimal PDF with one line of Helvetica text per page."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # page tree, filled in once the page objects are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R >> >> >>" % len(objects)
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    path.write_bytes(bytes(data))
+
+
+class TestIndexDedupe:
+    """Tests for the at-most-one in-flight indexing task guarantee."""
+
+    @pytest.fixture
+    def redis(self, monkeypatch):
+        fake = FakeRedis()
+        monkeypatch.setattr(rag_tasks, "get_redis", lambda: fake)
+        return fake
+
+    @pytest.fixture
+    def queued(self, monkeypatch):
+        calls = []
+        monkeypatch.setattr(rag_tasks.index_email, "delay", lambda *args: calls.append(args))
+        return calls
+
+    def test_enqueue_drops_duplicates(self, redis, queued):
+        """Test a second enqueue for the same entity is dropped while the first is in flight."""
+        assert rag_tasks.enqueue_index("email", "e1", "u1") is True
+        assert rag_tasks.enqueue_index("email", "e1", "u1") is False
+        assert rag_tasks.enqueue_index("email", "e2", "u1") is True
+
+        assert queued == [("e1", "u1"), ("e2", "u1")]
+        assert redis.ttls["idx:email:e1"] == rag_tasks.INDEX_DEDUPE_TTL_SECONDS
+
+    @pytest.mark.parametrize(
+        "outcome",
+        [{"status": "success"}, {"status": "skipped"}, RuntimeError("indexing failed")],
+        ids=["success", "skipped", "final-failure"],
+    )
+    def test_finished_task_releases_key(self, monkeypatch, redis, queued, outcome):
+        """Test the key is released once the task finishes, however it ends."""
+        rag_tasks.enqueue_index("email", "e1", "u1")
+        monkeypatch.setattr(rag_tasks, "run_async", _finish_with(outcome))
+
+        if isinstance(outcome, BaseException):
+            with pytest.raises(type(outcome)):
+                rag_tasks._run_index_task("email", "e1", _noop())
+        else:
+            assert rag_tasks._run_index_task("email", "e1", _noop()) == outcome
+
+        assert "idx:email:e1" not in redis.ttls
+        assert rag_tasks.enqueue_index("email", "e1", "u1") is True
+
+    def test_retry_keeps_key(self, monkeypatch, redis, queued):
+        """Test a scheduled retry keeps the key so no duplicate task can be queued."""
+        rag_tasks.enqueue_index("email", "e1", "u1")
+        monkeypatch.setattr(rag_tasks, "run_async", _finish_with(Retry()))
+
+        with pytest.raises(Retry):
+            rag_tasks._run_index_task("email", "e1", _noop())
+
+        assert redis.ttls["idx:email:e1"] > rag_tasks.INDEX_RETRY_COUNTDOWN_SECONDS
+        assert rag_tasks.enqueue_index("email", "e1", "u1") is False
+        assert queued == [("e1", "u1")]
+
+
+class TestTextExtraction:
+    """Tests for document text extraction."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 1024])
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "",
+            "   \n\t ",
+            "one",
+            "hello world  foo\nbar baz ",
+            "  leading and trailing  ",
+            "Bună ziua, mulțumesc pentru ședință și întâlnire",
+            "ăăă ț țț 日本語 テキスト",
+        ],
+        ids=["empty", "whitespace", "one-word", "ascii", "padded", "romanian", "multibyte"],
+    )
+    async def test_extract_txt(self, monkeypatch, tmp_path, content, chunk_size):
+        """Test streamed TXT extraction keeps the text and counts words across chunk boundaries."""
+        path = tmp_path / "doc.txt"
+        path.write_bytes(content.encode())
+        monkeypatch.setattr(rag_tasks, "TXT_READ_CHUNK_SIZE", chunk_size)
+
+        text, word_count = await rag_tasks._extract_txt(str(path))
+
+        assert text == content
+        assert word_count == len(content.split())
+
+    async def test_extract_txt_replaces_invalid_utf8(self, tmp_path):
+        """Test invalid UTF-8 bytes are replaced rather than failing the extraction."""
+        path = tmp_path / "doc.txt"
+        path.write_bytes(b"caf\xe9 ok")
+
+        text, word_count = await rag_tasks._extract_txt(str(path))
+
+        assert text == "caf\ufffd ok"
+        assert word_count == 2
+
+    def test_extract_docx(self, tmp_path):
+        """Test DOCX paragraphs, tabs and breaks are turned into plain text."""
+        path = tmp_path / "doc.docx"
+        _write_docx(
+            path,
+            [
+                "<w:r><w:t>Project </w:t></w:r><w:r><w:t>update</w:t></w:r>",
+                "<w:r><w:t>Name</w:t><w:tab/><w:t>Owner</w:t></w:r>",
+                "<w:r><w:t>Line one</w:t><w:br/><w:t>Line two</w:t><w:cr/><w:t>end</w:t></w:r>",
+                "",
+            ],
+        )
+
+        assert rag_tasks._extract_docx(str(path)) == (
+            "Project update\nName\tOwner\nLine one\nLine two\nend\n"
+        )
+
+    def test_extract_pdf(self, tmp_path):
+        """Test PDF text is extracted page by page along with the page count."""
+        pytest.importorskip("pypdfium2")
+        path = tmp_path / "doc.pdf"
+        _write_pdf(path, ["First page", "Second page"])
+
+        assert rag_tasks._extract_pdf(str(path)) == ("First page\nSecond page", 2)
@@ -5,8 +5,60 @@ Tests authentication, authorization, encryption, and security utilities.
 
 import pytest
 from unittest.mock import MagicMock, patch
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import base64
+import binascii
+import hashlib
+import hmac
+import os
+import re
+import struct
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Deque, Dict, Optional
+
+import orjson
+import pybase64
+
+
+SQL_DANGEROUS_PATTERNS = ["DROP", "DELETE", "INSERT", "UPDATE", "--", ";", "'"]
+_SQL_DANGEROUS_RE = re.compile("|".join(map(re.escape, SQL_DANGEROUS_PATTERNS)), re.IGNORECASE)
+
+_PASSWORD_SPECIALS = frozenset("!@#$%^&*()_+-=[]{}|;:,.<>?")
+
+# The test JWT header and signature never change, so encode them once
+_JWT_HEADER_B64 = pybase64.b64encode(orjson.dumps({"alg": "HS256", "typ": "JWT"})).decode()
+_JWT_SIGNATURE_B64 = pybase64.b64encode(b"signature").decode()
+
+_PACK_COUNTER = struct.Struct(">Q").pack
+_UNPACK_CODE = struct.Struct(">I").unpack_from
+# TOTP secrets repeat across calls, so decode each one once
+_totp_key = lru_cache(maxsize=128)(base64.b32decode)
+
+
+@lru_cache(maxsize=256)
+def _xor_table(key_byte: int) -> bytes:
+    """Translate table that XORs every byte with a single-byte key."""
+    return bytes(b ^ key_byte for b in range(256))
+
+
+CSRF_TOKEN_BYTES = 32
+CSRF_POOL_SIZE = 256
+_csrf_token_pool: list = []
+
+
+def _refill_csrf_pool() -> None:
+    """Draw a whole pool of CSRF tokens from one urandom call."""
+    hex_chars = binascii.hexlify(os.urandom(CSRF_TOKEN_BYTES * CSRF_POOL_SIZE)).decode("ascii")
+    step = CSRF_TOKEN_BYTES * 2
+    _csrf_token_pool[:] = [hex_chars[i:i + step] for i in range(0, len(hex_chars), step)]
+
+
+# Unsalted test hash, so it is pure and safe to memoize; real salted hashes must not be
+@lru_cache(maxsize=4096)
+def _hash_password_cached(password: str) -> str:
+    return hashlib.sha256(password.encode()).hexdigest()
 
 
 class TestSecurity:
@@ -26,8 +78,7 @@ class TestSecurity:
 
     def _hash_password(self, password: str) -> str:
         """Hash a password (simplified for testing)."""
-        import hashlib
-        return hashlib.sha256(password.encode()).hexdigest()
+        return _hash_password_cached(password)
 
     def _verify_password(self, password: str, hashed: str) -> bool:
         """Verify a password against its hash."""
@@ -46,14 +97,11 @@ class TestSecurity:
 
     def _create_token(self, user_id: str, expires_delta: timedelta) -> str:
         """Create a JWT token (simplified for testing)."""
-        import json
-        header = base64.b64encode(json.dumps({"alg": "HS256", "typ": "JWT"}).encode()).decode()
-        payload = base64.b64encode(json.dumps({
+        payload = pybase64.b64encode(orjson.dumps({
             "sub": user_id,
-            "exp": (datetime.utcnow() + expires_delta).timestamp(),
-        }).encode()).decode()
-        signature = base64.b64encode(b"signature").decode()
-        return f"{header}.{payload}.{signature}"
+            "exp": time.time() + expires_delta.total_seconds(),
+        })).decode()
+        return f"{_JWT_HEADER_B64}.{payload}.{_JWT_SIGNATURE_B64}"
 
     def test_jwt_token_validation(self):
         """Test JWT token validation."""
@@ -66,13 +114,12 @@ class TestSecurity:
     def _is_token_valid(self, token: str) -> bool:
         """Validate a JWT token (simplified for testing)."""
         try:
-            import json
             parts = token.split(".")
             if len(parts) != 3:
                 return False
-            payload = json.loads(base64.b64decode(parts[1]))
+            payload = orjson.loads(pybase64.b64decode(parts[1]))
             exp = payload.get("exp", 0)
-            return datetime.utcnow().timestamp() < exp
+            return time.time() < exp
         except Exception:
             return False
 
@@ -85,19 +132,15 @@ class TestSecurity:
         assert code is not None
         assert len(code) == 6
         assert code.isdigit()
+        # RFC 6238 appendix B vector for the ASCII secret "12345678901234567890" at T=59
+        assert self._generate_totp("GEZDGNBVGY3TQOJQGEZDGNBVGY3TQOJQ", for_time=59) == "287082"
 
-    def _generate_totp(self, secret: str) -> str:
-        """Generate a TOTP code (simplified for testing)."""
-        import time
-        import hashlib
-        import struct
-
-        counter = int(time.time()) // 30
-        key = base64.b32decode(secret)
-        msg = struct.pack(">Q", counter)
-        h = hashlib.sha1(key + msg).digest()
+    def _generate_totp(self, secret: str, for_time: Optional[float] = None) -> str:
+        """Generate an RFC 6238 TOTP code (HMAC-SHA1, 30 second steps)."""
+        counter = int(time.time() if for_time is None else for_time) // 30
+        h = hmac.new(_totp_key(secret), _PACK_COUNTER(counter), "sha1").digest()
         offset = h[-1] & 0x0F
-        code = struct.unpack(">I", h[offset:offset + 4])[0] & 0x7FFFFFFF
+        code = _UNPACK_CODE(h, offset)[0] & 0x7FFFFFFF
         return str(code % 1000000).zfill(6)
 
     def test_encryption_decryption(self):
@@ -110,19 +153,23 @@ class TestSecurity:
 
         assert encrypted != plaintext
         assert decrypted == plaintext
+        assert self._decrypt(self._encrypt(plaintext, "k"), "k") == plaintext
 
     def _encrypt(self, plaintext: str, key: str) -> str:
         """Encrypt data (simplified XOR for testing)."""
-        key_bytes = (key * (len(plaintext) // len(key) + 1))[:len(plaintext)]
-        encrypted = bytes(a ^ b for a, b in zip(plaintext.encode(), key_bytes.encode()))
-        return base64.b64encode(encrypted).decode()
+        return pybase64.b64encode(self._xor(plaintext.encode(), key.encode())).decode()
 
     def _decrypt(self, ciphertext: str, key: str) -> str:
         """Decrypt data (simplified XOR for testing)."""
-        encrypted = base64.b64decode(ciphertext)
-        key_bytes = (key * (len(encrypted) // len(key) + 1))[:len(encrypted)]
-        decrypted = bytes(a ^ b for a, b in zip(encrypted, key_bytes.encode()))
-        return decrypted.decode()
+        return self._xor(pybase64.b64decode(ciphertext), key.encode()).decode()
+
+    def _xor(self, data: bytes, key: bytes) -> bytes:
+        """XOR data with the repeated key as one big-int operation instead of per byte."""
+        if len(key) == 1:
+            return data.translate(_xor_table(key[0]))
+        n = len(data)
+        key_stream = (key * (n // len(key) + 1))[:n]
+        return (int.from_bytes(data, "big") ^ int.from_bytes(key_stream, "big")).to_bytes(n, "big")
 
     def test_input_sanitization(self):
         """Test input sanitization for XSS prevention."""
@@ -135,17 +182,36 @@ class TestSecurity:
         assert "<script>" not in sanitized_malicious
         assert "alert" not in sanitized_malicious
         assert sanitized_safe == safe_input
+        assert self._sanitize_input("a<SCRIPT src=x>1</Script>b<script>2</script>c") == "abc"
+        assert self._sanitize_input("<script>" * 10000) == "&lt;script&gt;" * 10000
 
     def _sanitize_input(self, text: str) -> str:
         """Sanitize input to prevent XSS."""
         import html
-        import re
 
         # Strip script tags and their contents, then escape residual HTML entities
-        without_scripts = re.sub(
-            r"<script.*?>.*?</script>", "", text, flags=re.IGNORECASE | re.DOTALL
-        )
-        return html.escape(without_scripts)
+        return html.escape(self._strip_scripts(text))
+
+    def _strip_scripts(self, text: str) -> str:
+        """Remove script blocks in one linear pass; an unclosed ``<script`` ends the scan."""
+        data = text.encode()
+        lowered = data.lower()
+        parts = []
+        pos = 0
+        while True:
+            start = lowered.find(b"<script", pos)
+            if start < 0:
+                break
+            tag_end = lowered.find(b">", start + 7)
+            if tag_end < 0:
+                break
+            end = lowered.find(b"</script>", tag_end + 1)
+            if end < 0:
+                break
+            parts.append(data[pos:start])
+            pos = end + 9
+        parts.append(data[pos:])
+        return b"".join(parts).decode()
 
     def test_sql_injection_prevention(self):
         """Test SQL injection prevention."""
@@ -157,9 +223,7 @@ class TestSecurity:
 
     def _is_safe_sql_input(self, text: str) -> bool:
         """Check if input is safe from SQL injection."""
-        dangerous_patterns = ["DROP", "DELETE", "INSERT", "UPDATE", "--", ";", "'"]
-        text_upper = text.upper()
-        return not any(pattern in text_upper for pattern in dangerous_patterns)
+        return _SQL_DANGEROUS_RE.search(text) is None
 
     def test_rate_limiting(self):
         """Test rate limiting functionality."""
@@ -189,11 +253,22 @@ class TestSecurity:
         """Check if password meets strength requirements."""
         if len(password) < 8:
             return False
-        has_upper = any(c.isupper() for c in password)
-        has_lower = any(c.islower() for c in password)
-        has_digit = any(c.isdigit() for c in password)
-        has_special = any(c in "!@#$%^&*()_+-=[]{}|;:,.<>?" for c in password)
-        return has_upper and has_lower and has_digit and has_special
+        # One pass collecting a bit per character class, stopping once all four are seen
+        mask = 0
+        for char in password:
+            if char.isupper():
+                mask |= 1
+            elif char.islower():
+                mask |= 2
+            elif char.isdigit():
+                mask |= 4
+            elif char in _PASSWORD_SPECIALS:
+                mask |= 8
+            else:
+                continue
+            if mask == 0b1111:
+                return True
+        return False
 
     def test_csrf_token_generation(self):
         """Test CSRF token generation."""
@@ -205,10 +280,18 @@ class TestSecurity:
         assert token1 != token2
         assert len(token1) >= 32
 
+    def test_csrf_token_pool_refills(self):
+        """Test CSRF tokens stay unique across pool refills."""
+        tokens = {self._generate_csrf_token() for _ in range(CSRF_POOL_SIZE * 2 + 1)}
+
+        assert len(tokens) == CSRF_POOL_SIZE * 2 + 1
+        assert all(len(token) == CSRF_TOKEN_BYTES * 2 for token in tokens)
+
     def _generate_csrf_token(self) -> str:
         """Generate a CSRF token."""
-        import secrets
-        return secrets.token_hex(32)
+        if not _csrf_token_pool:
+            _refill_csrf_pool()
+        return _csrf_token_pool.pop()
 
     def test_audit_log_creation(self):
         """Test audit log entry creation."""
@@ -230,7 +313,7 @@ class TestSecurity:
         """Create an audit log entry."""
         return {
             **kwargs,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
         }
 
 
@@ -240,21 +323,22 @@ class RateLimiter:
     def __init__(self, max_requests: int, window_seconds: int):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests = {}
+        # Per-user monotonic request times, oldest first
+        self.requests: Dict[str, Deque[float]] = {}
 
     def is_allowed(self, user_id: str) -> bool:
         """Check if request is allowed."""
-        now = datetime.utcnow()
-        if user_id not in self.requests:
-            self.requests[user_id] = []
+        now = time.monotonic()
+        window_start = now - self.window_seconds
+        timestamps = self.requests.get(user_id)
+        if timestamps is None:
+            timestamps = self.requests[user_id] = deque(maxlen=self.max_requests)
 
-        window_start = now - timedelta(seconds=self.window_seconds)
-        self.requests[user_id] = [
-            t for t in self.requests[user_id] if t > window_start
-        ]
+        while timestamps and timestamps[0] <= window_start:
+            timestamps.popleft()
 
-        if len(self.requests[user_id]) >= self.max_requests:
+        if len(timestamps) >= self.max_requests:
             return False
 
-        self.requests[user_id].append(now)
+        timestamps.append(now)
         return True
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Render a pytest-benchmark JSON report as a markdown table.
+
+Usage: python scripts/benchmark_to_md.py [backend/benchmark-report.json]
+"""
+
+import json
+import sys
+from collections import defaultdict
+
+DEFAULT_REPORT = "backend/benchmark-report.json"
+
+
+def format_extra_info(extra_info: dict) -> str:
+    """Format extra_info values such as recall or throughput."""
+    parts = []
+    for key, value in sorted(extra_info.items()):
+        if isinstance(value, float):
+            value = f"{value:.4g}"
+        parts.append(f"{key}={value}")
+    return ", ".join(parts)
+
+
+def render(report: dict) -> str:
+    """Render benchmarks grouped by benchmark group."""
+    groups = defaultdict(list)
+    for bench in report["benchmarks"]:
+        groups[bench.get("group") or "ungrouped"].append(bench)
+
+    lines = [
+        "# OpenFyxer Performance Report",
+        "",
+        f"- Date: {report.get('datetime', 'unknown')}",
+        f"- Python: {report.get('machine_info', {}).get('python_version', 'unknown')}",
+    ]
+
+    for group, benches in sorted(groups.items()):
+        lines += [
+            "",
+            f"## {group}",
+            "",
+            "| Benchmark | Median (ms) | OPS | Rounds | Extra |",
+            "|-----------|-------------|-----|--------|-------|",
+        ]
+        for bench in sorted(benches, key=lambda b: b["stats"]["median"]):
+            stats = bench["stats"]
+            lines.append(
+                f"| {bench['name']} | {stats['median'] * 1000:.3f} | {stats['ops']:.1f} "
+                f"| {stats['rounds']} | {format_extra_info(bench.get('extra_info', {}))} |"
+            )
+
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_REPORT
+    with open(path) as f:
+        report = json.load(f)
+    sys.stdout.write(render(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Creates sample data for demonstration purposes.
 """
 
 import asyncio
+import io
 import httpx
 import json
 from datetime import datetime, timedelta
@@ -214,7 +215,7 @@ async def create_sample_emails(client: httpx.AsyncClient, token: str):
     print("\nCreating sample emails...")
     headers = {"Authorization": f"Bearer {token}"}
     
-    for email in SAMPLE_EMAILS:
+    async def post_email(email: dict):
         try:
             response = await client.post(
                 f"{API_BASE_URL}/emails/demo",
@@ -234,6 +235,8 @@ async def create_sample_emails(client: httpx.AsyncClient, token: str):
         except Exception as e:
             print(f"  Error creating email: {e}")
 
+    await asyncio.gather(*(post_email(email) for email in SAMPLE_EMAILS))
+
 
 async def create_sample_events(client: httpx.AsyncClient, token: str):
     """Create sample calendar events."""
@@ -242,7 +245,7 @@ async def create_sample_events(client: httpx.AsyncClient, token: str):
     
     now = datetime.utcnow()
     
-    for event in SAMPLE_CALENDAR_EVENTS:
+    async def post_event(event: dict):
         try:
             start_time = now + timedelta(hours=event["start_offset_hours"])
             end_time = start_time + timedelta(hours=event["duration_hours"])
@@ -266,13 +269,15 @@ async def create_sample_events(client: httpx.AsyncClient, token: str):
         except Exception as e:
             print(f"  Error creating event: {e}")
 
+    await asyncio.gather(*(post_event(event) for event in SAMPLE_CALENDAR_EVENTS))
+
 
 async def create_sample_meetings(client: httpx.AsyncClient, token: str):
     """Create sample meetings with transcripts."""
     print("\nCreating sample meetings...")
     headers = {"Authorization": f"Bearer {token}"}
     
-    for meeting in SAMPLE_MEETINGS:
+    async def post_meeting(meeting: dict):
         try:
             response = await client.post(
                 f"{API_BASE_URL}/meetings",
@@ -295,16 +300,19 @@ async def create_sample_meetings(client: httpx.AsyncClient, token: str):
         except Exception as e:
             print(f"  Error creating meeting: {e}")
 
+    await asyncio.gather(*(post_meeting(meeting) for meeting in SAMPLE_MEETINGS))
+
 
 async def create_sample_documents(client: httpx.AsyncClient, token: str):
     """Create sample documents for RAG."""
     print("\nCreating sample documents...")
     headers = {"Authorization": f"Bearer {token}"}
     
-    for doc in SAMPLE_DOCUMENTS:
+    async def upload_document(doc: dict):
         try:
             files = {
-                "file": (doc["filename"], doc["content"].encode(), "text/plain")
+                # A file object lets httpx read the multipart body in chunks
+                "file": (doc["filename"], io.BytesIO(doc["content"].encode()), "text/plain")
             }
             response = await client.post(
                 f"{API_BASE_URL}/rag/documents",
@@ -318,6 +326,8 @@ async def create_sample_documents(client: httpx.AsyncClient, token: str):
         except Exception as e:
             print(f"  Error uploading document: {e}")
 
+    await asyncio.gather(*(upload_document(doc) for doc in SAMPLE_DOCUMENTS))
+
 
 async def test_rag_query(client: httpx.AsyncClient, token: str):
     """Test RAG query functionality."""
@@ -330,7 +340,7 @@ async def test_rag_query(client: httpx.AsyncClient, token: str):
         "Who are the meeting participants?",
     ]
     
-    for query in queries:
+    async def run_query(query: str):
         try:
             response = await client.post(
                 f"{API_BASE_URL}/rag/query",
@@ -346,6 +356,8 @@ async def test_rag_query(client: httpx.AsyncClient, token: str):
         except Exception as e:
             print(f"  Error querying: {e}")
 
+    await asyncio.gather(*(run_query(query) for query in queries))
+
 
 async def main():
     """Main demo initialization function."""
@@ -353,7 +365,9 @@ async def main():
     print("OpenFyxer Demo Initialization")
     print("=" * 60)
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    # The per-item POSTs in each step run concurrently, so allow enough parallel connections
+    limits = httpx.Limits(max_connections=20)
+    async with httpx.AsyncClient(timeout=30.0, limits=limits) as client:
         try:
             health = await client.get(f"{API_BASE_URL.replace('/api/v1', '')}/health")
             if health.status_code != 200: